@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic stand-in for ChatOllama that replays a fixed tool-calling script.
+
+    ``turns`` lists the tool calls to emit for each model turn, e.g.
+    ``[[{"name": "menu.list_items", "args": {}}], [{"name": "orders.list", "args": {"limit": 5}}]]``.
+    Calls within one turn are independent and may run concurrently. Once the
+    script is exhausted the model answers with ``final_message``.
+    """
+
+    turns: List[List[Dict[str, Any]]] = []
+    final_message: str = "Done."
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _generate(
+            self,
+            messages: List[BaseMessage],
+            stop: Optional[List[str]] = None,
+            run_manager: Optional[CallbackManagerForLLMRun] = None,
+            **kwargs: Any,
+    ) -> ChatResult:
+        step = sum(isinstance(m, AIMessage) for m in messages)
+        if step < len(self.turns):
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": call["name"], "args": call.get("args", {}), "id": f"call_{step}_{i}", "type": "tool_call"}
+                    for i, call in enumerate(self.turns[step])
+                ],
+            )
+        else:
+            message = AIMessage(content=self.final_message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
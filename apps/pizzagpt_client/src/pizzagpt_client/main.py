@@ -1,36 +1,46 @@
 import asyncio
+from langchain_core.language_models import BaseChatModel
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain.agents import create_agent
 from langchain_ollama import ChatOllama
 
+from pizzagpt_client.runner import ClientRunner
 
-async def main():
-    client = MultiServerMCPClient(
+
+def build_client(url: str = "http://localhost:8000/mcp") -> MultiServerMCPClient:
+    return MultiServerMCPClient(
         {
             "pizzagpt": {
                 "transport": "streamable_http",
-                "url": "http://localhost:8000/mcp",
+                "url": url,
             }
         }
     )
 
-    llm = ChatOllama(
+
+def build_llm() -> ChatOllama:
+    return ChatOllama(
         model="llama3.2:3b",
         validate_model_on_init=True,
         temperature=0,
     )
 
+
+async def build_agent(client: MultiServerMCPClient, llm: BaseChatModel):
     tools = await client.get_tools()
-    agent = create_agent(
+    return create_agent(
         model=llm,
         tools=tools,
     )
-    math_response = await agent.ainvoke(
-        {"messages": [{"role": "user", "content": "what's (3 + 5) x 12?"}]}
-    )
-    weather_response = await agent.ainvoke(
-        {"messages": [{"role": "user", "content": "what is the weather in nyc?"}]}
-    )
+
+
+async def main():
+    # One long-lived MCP session and cached tool manifest, conversations in parallel.
+    async with ClientRunner(build_client(), build_llm()) as runner:
+        math_response, weather_response = await runner.run_many([
+            "what's (3 + 5) x 12?",
+            "what is the weather in nyc?",
+        ])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from langchain.agents import create_agent
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp import ClientSession
+from mcp.types import Tool as MCPTool
+
+
+def manifest_version(tools: List[MCPTool]) -> str:
+    """Content hash of a tool manifest (names, descriptions and schemas)."""
+    payload = json.dumps(
+        sorted((t.model_dump(mode="json", exclude_none=True) for t in tools), key=lambda t: t["name"]),
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def tools_url(mcp_url: str) -> str:
+    """The server's /tools/schemas manifest endpoint, served next to the MCP endpoint."""
+    return urlsplit(mcp_url)._replace(path="/tools/schemas", query="", fragment="").geturl()
+
+
+async def fetch_manifest_etag(connection: Dict[str, Any], etag: Optional[str] = None) -> Optional[str]:
+    """ETag (a content hash) of the server's /tools/schemas manifest, or None if the server does not serve one.
+
+    With ``etag`` the request is conditional: an unchanged manifest answers
+    304 without a body.
+    """
+    url = connection.get("url")
+    if not url:
+        return None
+    headers = dict(connection.get("headers") or {})
+    if etag:
+        headers["If-None-Match"] = etag
+    try:
+        async with httpx.AsyncClient(timeout=10) as http:
+            response = await http.get(tools_url(url), headers=headers)
+    except httpx.HTTPError:
+        return None
+    if response.status_code == 304:
+        return etag
+    if response.status_code != 200:
+        return None
+    return response.headers.get("etag")
+
+
+class ToolManifestCache:
+    """On-disk cache of each server's tool list, so startup can skip tools/list.
+
+    An entry is reused while its freshness key matches: ``{"etag": ...}``,
+    the ETag of the server's /tools/schemas manifest, which changes with any
+    tool name, description or input schema. Servers without that endpoint are
+    keyed on the name and version from their initialize response instead;
+    those entries also expire after ``max_age`` seconds.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_age: float = 3600):
+        self.cache_dir = Path(
+            cache_dir or os.getenv("PIZZAGPT_TOOL_CACHE_DIR", Path.home() / ".cache" / "pizzagpt_client")
+        )
+        self.max_age = max_age
+
+    def _path(self, server_name: str, url: str) -> Path:
+        return self.cache_dir / f"tools-{server_name}-{hashlib.sha1(url.encode()).hexdigest()[:12]}.json"
+
+    def load(self, server_name: str, url: str, key: Dict[str, Any]) -> Optional[List[MCPTool]]:
+        try:
+            entry = json.loads(self._path(server_name, url).read_text())
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        if "etag" not in key and time.time() - entry.get("fetched_at", 0) > self.max_age:
+            return None
+        return [MCPTool.model_validate(t) for t in entry["tools"]]
+
+    def save(self, server_name: str, url: str, key: Dict[str, Any], tools: List[MCPTool]) -> None:
+        path = self._path(server_name, url)
+        entry = {
+            "key": key,
+            "version": manifest_version(tools),
+            "fetched_at": time.time(),
+            "tools": [t.model_dump(mode="json", exclude_none=True) for t in tools],
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(entry))
+            tmp.replace(path)
+        except OSError:
+            pass  # the cache is an optimization only
+
+
+async def _list_tools(session: ClientSession) -> List[MCPTool]:
+    tools: List[MCPTool] = []
+    cursor = None
+    while True:
+        page = await session.list_tools(cursor=cursor)
+        tools.extend(page.tools)
+        cursor = page.nextCursor
+        if not cursor:
+            return tools
+
+
+class ClientRunner:
+    """Runs many agent conversations against the MCP servers of one client.
+
+    - one MCP session per server, opened once and shared by every tool call
+      (instead of a new HTTP session + initialize per call);
+    - the tool manifest comes from a ToolManifestCache and is only re-listed
+      when the server's /tools/schemas ETag changes (checked with a conditional GET at
+      startup and by refresh_tools());
+    - conversations run concurrently, at most ``max_concurrency`` at a time;
+      independent tool calls of one model turn already run concurrently in
+      the agent's ToolNode when invoked asynchronously.
+
+    Usage::
+
+        async with ClientRunner(build_client(), build_llm()) as runner:
+            results = await runner.run_many(["Show me the menu", "Track my order"])
+    """
+
+    def __init__(
+            self,
+            client: MultiServerMCPClient,
+            llm: BaseChatModel,
+            max_concurrency: int = 8,
+            manifest_cache: Optional[ToolManifestCache] = None,
+            refresh_interval: Optional[float] = None,
+    ):
+        self.client = client
+        self.llm = llm
+        self.manifest_cache = manifest_cache or ToolManifestCache()
+        self.refresh_interval = refresh_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._stack: Optional[AsyncExitStack] = None
+        self._sessions: Dict[str, ClientSession] = {}
+        self._manifests: Dict[str, List[MCPTool]] = {}
+        self._etags: Dict[str, Optional[str]] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self.agent = None
+
+    async def __aenter__(self) -> "ClientRunner":
+        self._stack = AsyncExitStack()
+        try:
+            for name, connection in self.client.connections.items():
+                session = await self._stack.enter_async_context(self.client.session(name, auto_initialize=False))
+                init = await session.initialize()
+                self._sessions[name] = session
+                # Taken before listing: a manifest that changes in between is re-listed next time.
+                etag = await fetch_manifest_etag(connection)
+                key = {"etag": etag} if etag else {"name": init.serverInfo.name, "version": init.serverInfo.version}
+                tools = self.manifest_cache.load(name, connection.get("url", ""), key)
+                if tools is None:
+                    tools = await _list_tools(session)
+                    self.manifest_cache.save(name, connection.get("url", ""), key, tools)
+                self._manifests[name] = tools
+                self._etags[name] = etag
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        self._build_agent()
+        if self.refresh_interval:
+            self._refresher = asyncio.create_task(self._refresh_loop())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+        self._sessions.clear()
+
+    @property
+    def tools(self) -> List[BaseTool]:
+        return [
+            convert_mcp_tool_to_langchain_tool(
+                self._sessions[name],
+                tool,
+                callbacks=self.client.callbacks,
+                tool_interceptors=self.client.tool_interceptors,
+                server_name=name,
+            )
+            for name, tools in self._manifests.items()
+            for tool in tools
+        ]
+
+    def _build_agent(self) -> None:
+        self.agent = create_agent(model=self.llm, tools=self.tools)
+
+    async def refresh_tools(self) -> bool:
+        """Re-list tools on servers whose /tools/schemas ETag changed; rebuild the agent if any manifest changed.
+
+        Servers without /tools/schemas are always re-listed.
+        """
+        changed = False
+        for name, session in self._sessions.items():
+            connection = self.client.connections[name]
+            etag = await fetch_manifest_etag(connection, self._etags.get(name))
+            if etag is not None and etag == self._etags.get(name):
+                continue
+            tools = await _list_tools(session)
+            self._etags[name] = etag
+            if etag is not None:
+                self.manifest_cache.save(name, connection.get("url", ""), {"etag": etag}, tools)
+            if manifest_version(tools) != manifest_version(self._manifests[name]):
+                self._manifests[name] = tools
+                changed = True
+        if changed:
+            self._build_agent()
+        return changed
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh_tools()
+            except Exception:
+                pass  # keep serving with the current manifest
+
+    async def ainvoke(self, prompt: str | Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run one conversation, waiting for a free slot if max_concurrency are in flight."""
+        if self.agent is None:
+            raise RuntimeError("ClientRunner must be entered with 'async with' before use")
+        state = {"messages": [{"role": "user", "content": prompt}]} if isinstance(prompt, str) else prompt
+        async with self._semaphore:
+            return await self.agent.ainvoke(state, config=config)
+
+    async def run_many(
+            self,
+            prompts: List[str | Dict[str, Any]],
+            config: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any] | BaseException]:
+        """Run conversations in parallel; a failed conversation yields its exception."""
+        return await asyncio.gather(*(self.ainvoke(p, config) for p in prompts), return_exceptions=True)
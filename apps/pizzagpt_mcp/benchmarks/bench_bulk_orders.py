@@ -0,0 +1,70 @@
+"""
+Orders per second: orders.create one at a time versus orders.create_many batches.
+
+Runs against a throwaway SQLite database unless DATABASE_URL is set.
+
+Usage:
+    python benchmarks/bench_bulk_orders.py --orders 2000 --batch-size 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+
+async def run(n_orders: int, batch_size: int, items_per_order: int) -> None:
+    from pizzagpt_mcp.db import database
+    from pizzagpt_mcp.db.seed_data import seed_with_orm
+    from pizzagpt_mcp.tools import customers, menu, orders
+
+    seed_with_orm()
+
+    menu_ids = [i["id"] for i in (await menu.list_items.fn())["items"]]
+    customer_ids = [c["id"] for c in (await customers.list_customers.fn())["customers"]]
+    rng = random.Random(42)
+
+    def make_order():
+        return {
+            "customer_id": rng.choice(customer_ids),
+            "items": [
+                {"menu_item_id": rng.choice(menu_ids), "quantity": rng.randint(1, 3)}
+                for _ in range(items_per_order)
+            ],
+        }
+
+    batch = [make_order() for _ in range(n_orders)]
+    start = time.perf_counter()
+    for row in batch:
+        await orders.create_order.fn(row["customer_id"], row["items"])
+    single = time.perf_counter() - start
+
+    batch = [make_order() for _ in range(n_orders)]
+    start = time.perf_counter()
+    for i in range(0, n_orders, batch_size):
+        await orders.create_many.fn(batch[i:i + batch_size])
+    bulk = time.perf_counter() - start
+
+    print(f"{n_orders} orders x {items_per_order} items")
+    print(f"  orders.create       {n_orders / single:10.0f} orders/s ({single:.2f}s)")
+    print(f"  orders.create_many  {n_orders / bulk:10.0f} orders/s ({bulk:.2f}s, batch={batch_size})")
+    await database.get_async_engine().dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--items-per-order", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before pizzagpt_mcp.db.database creates its engines.
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tmp) / 'bench.db'}")
+        asyncio.run(run(args.orders, args.batch_size, args.items_per_order))
+
+
+if __name__ == "__main__":
+    main()
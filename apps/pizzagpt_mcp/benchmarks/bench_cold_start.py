@@ -0,0 +1,99 @@
+"""
+Cold start: where import time goes and how long until the server answers.
+
+  1. Runs ``python -X importtime -c "import pizzagpt_mcp.server"`` and reports
+     total import time, the pizzagpt_mcp modules (the wildcard tool/api
+     imports in server.py) and the heaviest third-party packages.
+  2. Starts ``python -m pizzagpt_mcp.main --mode migrate`` on a throwaway
+     SQLite database and measures the time until GET /tools answers.
+
+Usage:
+    python benchmarks/bench_cold_start.py --runs 3 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from bench_e2e import _free_port  # noqa: E402
+
+
+def import_profile(env: Dict[str, str]) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) per import, from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pizzagpt_mcp.server"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def time_to_ready(env: Dict[str, str]) -> float:
+    port = _free_port()
+    env = {**env, "MCP_HOST": "127.0.0.1", "MCP_PORT": str(port), "MCP_LOG_LEVEL": "warning"}
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "pizzagpt_mcp.main", "--mode", "migrate"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/tools", timeout=1)
+                return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.02)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="third-party packages to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{Path(tmp) / 'bench.db'}"}
+
+        runs = [import_profile(env) for _ in range(args.runs)]
+        rows = min(runs, key=lambda r: sum(cum for _, depth, _, cum in r if depth == 0))
+        total = sum(cum for _, depth, _, cum in rows if depth == 0)
+        print(f"import pizzagpt_mcp.server: {total / 1000:.0f} ms (best of {args.runs})")
+
+        print("\npizzagpt_mcp modules (self / cumulative ms):")
+        for name, depth, self_us, cum_us in rows:
+            if name.startswith("pizzagpt_mcp"):
+                print(f"  {'  ' * depth}{name:<44}{self_us / 1000:8.1f}{cum_us / 1000:10.1f}")
+
+        by_package: Dict[str, int] = defaultdict(int)
+        for name, _, self_us, _ in rows:
+            by_package[name.split(".")[0]] += self_us
+        print(f"\nheaviest packages by self time (ms), top {args.top}:")
+        for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"  {package:<30}{self_us / 1000:8.1f}  {100 * self_us / total:5.1f}%")
+
+        ready = [time_to_ready(env) for _ in range(args.runs)]
+        print(f"\nprocess start -> first /tools response: median {statistics.median(ready) * 1000:.0f} ms "
+              f"(min {min(ready) * 1000:.0f}, max {max(ready) * 1000:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+End-to-end MCP tool latency benchmark over streamable-http.
+
+Starts a local pizzagpt_mcp server on a throwaway SQLite database (filled with
+``--mode generate``) and then runs one of two modes:
+
+  tools  drive menu.*, customers.* and orders.* directly with N concurrent
+         MCP sessions and report p50/p95/p99 latency and throughput per tool.
+  agent  run pizzagpt_client's agent loop with a deterministic scripted chat
+         model instead of Ollama, and split conversation time into tool time
+         and agent (LangChain/LangGraph) overhead. --runner uses
+         pizzagpt_client.runner.ClientRunner (one long-lived MCP session)
+         instead of a new MCP session per tool call.
+
+Usage:
+    python benchmarks/bench_e2e.py tools --concurrency 16 --requests 200
+    python benchmarks/bench_e2e.py agent --concurrency 8 --conversations 100
+    python benchmarks/bench_e2e.py agent --concurrency 8 --conversations 100 --runner
+    python benchmarks/bench_e2e.py tools --url http://localhost:8000/mcp   # existing server
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from contextlib import AsyncExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastmcp import Client
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def local_server(orders: int, customers: int):
+    """Start pizzagpt_mcp.main in a subprocess and yield its MCP URL once /tools answers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        port = _free_port()
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(tmp) / 'bench.db'}",
+            "MCP_HOST": "127.0.0.1",
+            "MCP_PORT": str(port),
+            "MCP_LOG_LEVEL": "warning",
+        }
+        argv = [
+            sys.executable, "-m", "pizzagpt_mcp.main",
+            "--mode", "generate", "--orders", str(orders), "--customers", str(customers),
+        ]
+        proc = subprocess.Popen(argv, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.monotonic() + 300
+            while True:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"server exited with code {proc.returncode}")
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/tools", timeout=1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.2)
+            yield f"http://127.0.0.1:{port}/mcp"
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(title: str, latencies: Dict[str, List[float]], wall: Dict[str, float]) -> None:
+    print(title)
+    print(f"  {'name':<32}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>10}")
+    for name in sorted(latencies):
+        s = latencies[name]
+        print(
+            f"  {name:<32}{len(s):>7}{_percentile(s, 50):>10.2f}{_percentile(s, 95):>10.2f}"
+            f"{_percentile(s, 99):>10.2f}{statistics.fmean(s):>10.2f}{len(s) / wall[name]:>10.1f}"
+        )
+
+
+async def _call(client: Client, name: str, args: Dict[str, Any]) -> Any:
+    result = await client.call_tool(name, args)
+    return result.structured_content
+
+
+async def _fixtures(url: str) -> Dict[str, Any]:
+    async with Client(url) as client:
+        menu = (await _call(client, "menu.list_items", {}))["items"]
+        customers = (await _call(client, "customers.list", {"limit": 200}))["customers"]
+        orders = (await _call(client, "orders.list", {"limit": 200}))["orders"]
+    return {
+        "menu_ids": [m["id"] for m in menu],
+        "customer_ids": [c["id"] for c in customers],
+        "order_ids": [o["id"] for o in orders],
+    }
+
+
+def tool_workload(fx: Dict[str, Any], rng: random.Random) -> Dict[str, Callable[[], tuple[str, Dict[str, Any]]]]:
+    """Argument generators per benchmarked tool."""
+    return {
+        "menu.list_items": lambda: ("menu.list_items", {}),
+        "menu.get_item": lambda: ("menu.get_item", {"id": rng.choice(fx["menu_ids"])}),
+        "customers.get": lambda: ("customers.get", {"id": rng.choice(fx["customer_ids"])}),
+        "customers.list": lambda: ("customers.list", {"limit": 50}),
+        "customers.find_or_create": lambda: (
+            "customers.find_or_create", {"name": "Bench", "email": f"bench{rng.randint(0, 500)}@example.com"},
+        ),
+        "orders.get": lambda: ("orders.get", {"id": rng.choice(fx["order_ids"])}),
+        "orders.list": lambda: ("orders.list", {"limit": 20}),
+        "orders.create": lambda: ("orders.create", {
+            "customer_id": rng.choice(fx["customer_ids"]),
+            "items": [{"menu_item_id": rng.choice(fx["menu_ids"]), "quantity": 1} for _ in range(rng.randint(1, 3))],
+        }),
+        "orders.set_status": lambda: (
+            "orders.set_status", {"order_id": rng.choice(fx["order_ids"]), "status": "confirmed"},
+        ),
+    }
+
+
+async def _run_concurrently(concurrency: int, total: int, worker: Callable[[int], Awaitable[None]]) -> float:
+    counter = iter(range(total))
+
+    async def loop():
+        for i in counter:
+            await worker(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def bench_tools(url: str, concurrency: int, requests: int, only: Optional[List[str]]) -> None:
+    fx = await _fixtures(url)
+    rng = random.Random(7)
+    workload = tool_workload(fx, rng)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    wall: Dict[str, float] = {}
+
+    clients = [Client(url) for _ in range(concurrency)]
+    for c in clients:
+        await c.__aenter__()
+    try:
+        for tool, make_call in workload.items():
+            if only and tool not in only:
+                continue
+
+            async def worker(i: int, make_call=make_call, tool=tool):
+                name, args = make_call()
+                start = time.perf_counter()
+                await clients[i % concurrency].call_tool(name, args)
+                latencies[tool].append((time.perf_counter() - start) * 1000)
+
+            wall[tool] = await _run_concurrently(concurrency, requests, worker)
+    finally:
+        for c in clients:
+            await c.__aexit__(None, None, None)
+    report(f"tools mode: concurrency={concurrency}, requests/tool={requests}", latencies, wall)
+
+
+async def bench_agent(url: str, concurrency: int, conversations: int, use_runner: bool = False) -> None:
+    from langchain_core.callbacks import AsyncCallbackHandler
+    from pizzagpt_client.fake_model import ScriptedChatModel
+    from pizzagpt_client.main import build_agent, build_client
+    from pizzagpt_client.runner import ClientRunner
+
+    fx = await _fixtures(url)
+    model = ScriptedChatModel(turns=[
+        [
+            {"name": "menu.list_items", "args": {}},
+            {"name": "customers.find_or_create", "args": {"name": "Agent", "email": "agent@example.com"}},
+        ],
+        [{"name": "orders.create", "args": {
+            "customer_id": fx["customer_ids"][0],
+            "items": [{"menu_item_id": fx["menu_ids"][0], "quantity": 2}],
+        }}],
+        [{"name": "orders.list", "args": {"customer_id": fx["customer_ids"][0], "limit": 5}}],
+    ])
+
+    class ToolTimer(AsyncCallbackHandler):
+        """Records tool call intervals; tools within one turn may overlap."""
+
+        def __init__(self):
+            self.started: Dict[Any, float] = {}
+            self.intervals: List[tuple[float, float]] = []
+
+        async def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+            self.started[run_id] = time.perf_counter()
+
+        async def on_tool_end(self, output, *, run_id, **kwargs):
+            start, end = self.started.pop(run_id), time.perf_counter()
+            self.intervals.append((start, end))
+            latencies[f"tool:{kwargs.get('name') or 'tool'}"].append((end - start) * 1000)
+
+        @property
+        def busy_ms(self) -> float:
+            """Wall time during which at least one tool call was running."""
+            busy, current_end = 0.0, float("-inf")
+            for start, end in sorted(self.intervals):
+                if end > current_end:
+                    busy += end - max(start, current_end)
+                    current_end = end
+            return busy * 1000
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+
+    async with AsyncExitStack() as stack:
+        if use_runner:
+            runner = await stack.enter_async_context(
+                ClientRunner(build_client(url), model, max_concurrency=concurrency)
+            )
+            invoke = runner.ainvoke
+        else:
+            agent = await build_agent(build_client(url), model)
+
+            async def invoke(state, config):
+                return await agent.ainvoke(state, config=config)
+
+        async def worker(_: int):
+            timer = ToolTimer()
+            start = time.perf_counter()
+            await invoke(
+                {"messages": [{"role": "user", "content": "Order two pizzas for me."}]},
+                {"callbacks": [timer]},
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            latencies["conversation"].append(elapsed)
+            latencies["tool wall time/conversation"].append(timer.busy_ms)
+            latencies["agent overhead/conversation"].append(max(0.0, elapsed - timer.busy_ms))
+
+        total = await _run_concurrently(concurrency, conversations, worker)
+    report(
+        f"agent mode (scripted model{', ClientRunner' if use_runner else ''}): "
+        f"concurrency={concurrency}, conversations={conversations}",
+        latencies,
+        {name: total for name in latencies},
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["tools", "agent"])
+    parser.add_argument("--url", help="Benchmark an already running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="tools mode: calls per tool")
+    parser.add_argument("--conversations", type=int, default=50, help="agent mode: agent runs")
+    parser.add_argument("--runner", action="store_true", help="agent mode: use pizzagpt_client's ClientRunner")
+    parser.add_argument("--tool", action="append", help="tools mode: only benchmark these tools (repeatable)")
+    parser.add_argument("--orders", type=int, default=10000, help="orders generated for the local server")
+    parser.add_argument("--customers", type=int, default=1000, help="customers generated for the local server")
+    args = parser.parse_args()
+
+    async def run(url: str):
+        if args.mode == "tools":
+            await bench_tools(url, args.concurrency, args.requests, args.tool)
+        else:
+            await bench_agent(url, args.concurrency, args.conversations, args.runner)
+
+    if args.url:
+        asyncio.run(run(args.url))
+    else:
+        with local_server(args.orders, args.customers) as url:
+            asyncio.run(run(url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Tool response size: full responses versus fields projections and compact mode.
+
+Calls the list/get tools through an in-memory MCP client and reports the size
+of the text content an LLM client puts into its prompt (~4 bytes per token),
+plus the time to encode the largest response with FastMCP's default
+serializer versus orjson.
+
+Runs against a throwaway SQLite database (filled with generate mode) unless
+DATABASE_URL is set.
+
+Usage:
+    python benchmarks/bench_payload.py --orders 2000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+async def run(n_orders: int, n_customers: int) -> None:
+    from fastmcp import Client
+    from fastmcp.tools.tool import default_serializer
+    from pizzagpt_mcp.db import database
+    from pizzagpt_mcp.db.seed_data import generate_synthetic
+    from pizzagpt_mcp.serialization import dumps
+    from pizzagpt_mcp.server import mcp
+
+    database.init_db()
+    generate_synthetic(n_customers, 40, n_orders, 4, 42)
+
+    async with Client(mcp) as client:
+        async def call(name: str, args: Dict[str, Any]) -> Tuple[int, Any]:
+            result = await client.call_tool(name, args)
+            return sum(len(c.text.encode()) for c in result.content), result.structured_content
+
+        _, listed = await call("orders.list", {"limit": 1})
+        order_id = listed["orders"][0]["id"]
+        cases: List[Tuple[str, Dict[str, Any]]] = [
+            ("orders.list", {"limit": 50}),
+            ("orders.list", {"limit": 50, "compact": True}),
+            ("orders.list", {"limit": 50, "fields": ["id", "status", "total_cents"]}),
+            ("orders.get", {"id": order_id}),
+            ("orders.get", {"id": order_id, "compact": True}),
+            ("customers.list", {"limit": 100}),
+            ("customers.list", {"limit": 100, "compact": True}),
+            ("customers.list", {"limit": 100, "fields": ["id", "name"]}),
+            ("menu.list_items", {}),
+            ("menu.list_items", {"compact": True}),
+            ("menu.list_items", {"fields": ["id", "name", "size", "price_cents"]}),
+        ]
+        print(f"{'tool':<18}{'arguments':<52}{'bytes':>9}{'~tokens':>9}{'vs full':>9}")
+        full: Dict[str, int] = {}
+        for name, args in cases:
+            size, _ = await call(name, args)
+            variant = {k: v for k, v in args.items() if k not in ("id", "limit")}
+            full.setdefault(name, size)
+            print(f"{name:<18}{str(variant or 'full'):<52}{size:>9}{size // 4:>9}{size / full[name]:>9.0%}")
+
+        _, big = await call("orders.list", {"limit": 200})
+    for label, encode in (("default (pydantic_core)", default_serializer), ("orjson", dumps)):
+        start = time.perf_counter()
+        for _ in range(200):
+            encode(big)
+        print(f"encode orders.list limit=200 with {label:<24}{(time.perf_counter() - start) / 200 * 1000:8.3f} ms")
+    await database.get_async_engine().dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--customers", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before pizzagpt_mcp.db.database creates its engines.
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tmp) / 'bench.db'}")
+        asyncio.run(run(args.orders, args.customers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-call latency of the old per-tool ``create_all`` versus the startup schema gate.
+
+Usage:
+    python benchmarks/bench_schema_gate.py
+    python benchmarks/bench_schema_gate.py --url sqlite:///bench.db --url postgresql+psycopg://user:pw@localhost/pizzagpt
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, select
+
+from pizzagpt_mcp.db.database import make_engine
+from pizzagpt_mcp.db.models import MenuItem
+
+
+def _measure(fn, calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"  {label:<22} mean={statistics.fmean(samples):.3f}ms p50={statistics.median(samples):.3f}ms p95={p95:.3f}ms")
+
+
+def bench(url: str, calls: int) -> None:
+    engine = make_engine(url, echo=False)
+    SQLModel.metadata.create_all(engine)
+    ready = True
+
+    def query():
+        with Session(engine) as session:
+            session.exec(select(MenuItem).limit(1)).first()
+
+    def before():
+        SQLModel.metadata.create_all(engine)
+        query()
+
+    def after():
+        if not ready:
+            SQLModel.metadata.create_all(engine)
+        query()
+
+    print(f"{engine.url.render_as_string(hide_password=True)} ({calls} calls)")
+    _report("create_all per call", _measure(before, calls))
+    _report("readiness flag", _measure(after, calls))
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", help="Database URL to benchmark (repeatable)")
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        urls = args.url or [f"sqlite:///{Path(tmp) / 'bench.db'}"]
+        for url in urls:
+            bench(url, args.calls)
+
+
+if __name__ == "__main__":
+    main()
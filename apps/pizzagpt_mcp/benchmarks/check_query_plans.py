@@ -0,0 +1,39 @@
+"""
+Query plan regression check: every SELECT issued by the MCP tools must use an index.
+
+Thin wrapper around tests/test_query_plans.py (which runs with the rest of
+the test suite) for checking plans against a larger generated database.
+Exits with pytest's status: 1 when a query reads a whole table.
+
+Usage:
+    python benchmarks/check_query_plans.py
+    python benchmarks/check_query_plans.py --orders 200000 --customers 20000 --verbose
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+_TEST = Path(__file__).resolve().parent.parent / "tests" / "test_query_plans.py"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only regressions")
+    args = parser.parse_args()
+
+    os.environ["TEST_ORDERS"] = str(args.orders)
+    os.environ["TEST_CUSTOMERS"] = str(args.customers)
+    pytest_args = [str(_TEST), "-q"]
+    if args.verbose:
+        os.environ["QUERY_PLANS_VERBOSE"] = "1"
+        pytest_args.append("-s")
+    sys.exit(pytest.main(pytest_args))
+
+
+if __name__ == "__main__":
+    main()
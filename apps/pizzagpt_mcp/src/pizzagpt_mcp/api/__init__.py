@@ -1,6 +1,14 @@
-from .tools import tools
+from .export import export_customers
+from .metrics import metrics
+from .order_events import order_event_stream
+from .tools import tool_manifest, tool_schemas, tools
 
 
 __all__ = [
+    "export_customers",
+    "metrics",
+    "order_event_stream",
+    "tool_manifest",
+    "tool_schemas",
     "tools",
 ]
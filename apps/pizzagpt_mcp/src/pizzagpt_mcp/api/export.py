@@ -0,0 +1,29 @@
+import json
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+
+from pizzagpt_mcp.server import mcp
+from pizzagpt_mcp.tools import customers as customer_tools
+
+# Rows fetched per round trip; larger chunk_size values are clamped to it.
+MAX_EXPORT_CHUNK_SIZE = 10000
+
+
+@mcp.custom_route("/customers/export", methods=["GET"])
+async def export_customers(request: Request):
+    """Stream all customers as newline-delimited JSON."""
+    raw = request.query_params.get("chunk_size", "1000")
+    try:
+        chunk_size = int(raw)
+    except ValueError:
+        return JSONResponse({"ok": False, "error": f"invalid chunk_size: {raw}"}, status_code=400)
+    if chunk_size < 1:
+        return JSONResponse({"ok": False, "error": "chunk_size must be >= 1"}, status_code=400)
+    chunk_size = min(chunk_size, MAX_EXPORT_CHUNK_SIZE)
+
+    async def lines():
+        async for customer in customer_tools.iter_customers(chunk_size):
+            yield json.dumps(customer) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,10 @@
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from pizzagpt_mcp.middleware import registry
+from pizzagpt_mcp.server import mcp
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(_: Request) -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
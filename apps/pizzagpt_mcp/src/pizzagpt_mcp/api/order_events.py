@@ -0,0 +1,56 @@
+import asyncio
+import json
+import uuid
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+
+from pizzagpt_mcp.events import order_events
+from pizzagpt_mcp.server import mcp
+from pizzagpt_mcp.tools import orders as order_tools
+
+# Comment lines sent while idle so proxies keep the connection open.
+_KEEPALIVE_SECONDS = 15
+
+
+def _sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['order'])}\n\n"
+
+
+@mcp.custom_route("/orders/events", methods=["GET"])
+@mcp.custom_route("/orders/{order_id}/events", methods=["GET"])
+async def order_event_stream(request: Request):
+    """Server-sent events for one order (or every order), pushed by orders.set_status/add_item.
+
+    A per-order stream starts with the current state of the order; after
+    that nothing touches the database until the order changes.
+    """
+    order_id = request.path_params.get("order_id")
+    if order_id is not None:
+        try:
+            order_id = str(uuid.UUID(order_id))
+        except ValueError:
+            return JSONResponse({"ok": False, "error": f"invalid order_id: {order_id}"}, status_code=400)
+
+    async def events():
+        # Subscribe before reading the snapshot so no change can slip in between.
+        with order_events.subscribe(order_id) as queue:
+            if order_id is not None:
+                current = await order_tools.get_order.fn(order_id)
+                if not current["ok"]:
+                    yield f"event: error\ndata: {json.dumps(current)}\n\n"
+                    return
+                yield _sse({"id": 0, "type": "order.snapshot", "order": current["order"]})
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), _KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,15 +1,77 @@
+import gzip
+import hashlib
+from dataclasses import dataclass
+from typing import Dict
+
+import orjson
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 
 from pizzagpt_mcp.server import mcp
 
+# Below this size gzip costs more than it saves.
+_GZIP_MIN_BYTES = 512
+
+
+@dataclass(frozen=True, slots=True)
+class ToolManifest:
+    """A /tools or /tools/schemas response, encoded once per tool registry generation."""
+
+    generation: int
+    etag: str
+    body: bytes
+    gzipped: bytes
+
+
+# schemas (bool) -> the manifest of the current generation.
+_manifests: Dict[bool, ToolManifest] = {}
+
+
+async def tool_manifest(schemas: bool = False) -> ToolManifest:
+    """Return the current manifest, rebuilding it only if the tool registry changed.
+
+    The /tools body maps each tool name to its description; with schemas
+    (/tools/schemas) each name maps to {"description", "input_schema"}.
+    """
+    generation = mcp.tools_generation
+    manifest = _manifests.get(schemas)
+    if manifest is not None and manifest.generation == generation:
+        return manifest
+    registered = await mcp.get_tools()
+    body = orjson.dumps(
+        {
+            name: {"description": tool.description, "input_schema": tool.parameters} if schemas else tool.description
+            for name, tool in registered.items()
+            if tool.enabled
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    manifest = _manifests[schemas] = ToolManifest(
+        generation=generation,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+        body=body,
+        gzipped=gzip.compress(body, compresslevel=9, mtime=0),
+    )
+    return manifest
+
 
 @mcp.custom_route("/tools", methods=["GET"])
-async def tools(_: Request) -> JSONResponse:
-    response = {}
-    tools = await mcp.get_tools()
+async def tools(request: Request) -> Response:
+    """{name: description} for every tool."""
+    return _respond(request, await tool_manifest())
+
+
+@mcp.custom_route("/tools/schemas", methods=["GET"])
+async def tool_schemas(request: Request) -> Response:
+    """{name: {"description", "input_schema"}} for every tool."""
+    return _respond(request, await tool_manifest(schemas=True))
 
-    for tool in tools:
-        response[tool] = tools[tool].description
 
-    return JSONResponse(response)
+def _respond(request: Request, manifest: ToolManifest) -> Response:
+    headers = {"ETag": manifest.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if manifest.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    if len(manifest.body) >= _GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(manifest.gzipped, media_type="application/json", headers=headers)
+    return Response(manifest.body, media_type="application/json", headers=headers)
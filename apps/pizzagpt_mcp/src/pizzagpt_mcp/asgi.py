@@ -0,0 +1,41 @@
+"""
+ASGI entry point for running the MCP server under an external process manager.
+
+    uvicorn pizzagpt_mcp.asgi:app --workers 4
+    gunicorn -k uvicorn.workers.UvicornWorker -w 4 pizzagpt_mcp.asgi:app
+
+Every worker imports this module and builds its own app, engines and pools.
+The app uses stateless streamable-http: no MCP session state lives in a
+worker, so consecutive requests of one client may land on any worker.
+Prepare the database once before starting the workers (see launcher.py).
+With more than one worker set PIZZAGPT_CHANGE_FEED=1 (the launcher does), so
+order events, menu snapshots and read-your-writes routing see the writes of
+the other workers (see events/change_feed.py).
+"""
+from contextlib import asynccontextmanager
+
+from pizzagpt_mcp.api import tool_manifest
+from pizzagpt_mcp.db.change_log import CHANGE_FEED_ENABLED
+from pizzagpt_mcp.db.database import dispose_async_engines
+from pizzagpt_mcp.db.write_queue import close_write_queue
+from pizzagpt_mcp.events import change_feed
+from pizzagpt_mcp.server import mcp
+
+app = mcp.http_app(transport="streamable-http", stateless_http=True)
+
+_mcp_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def _lifespan(asgi_app):
+    async with _mcp_lifespan(asgi_app):
+        await tool_manifest()
+        if CHANGE_FEED_ENABLED:
+            await change_feed.start()
+        yield
+    await change_feed.close()
+    await close_write_queue()
+    await dispose_async_engines()
+
+
+app.router.lifespan_context = _lifespan
@@ -0,0 +1,9 @@
+from .menu_catalog import MenuCatalog, MenuSnapshot
+from .ttl_cache import TTLCache
+
+
+__all__ = [
+    "MenuCatalog",
+    "MenuSnapshot",
+    "TTLCache",
+]
@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from pizzagpt_mcp.db.change_log import record_change
+from pizzagpt_mcp.db.database import get_async_session
+from pizzagpt_mcp.db.models import MenuItem
+from pizzagpt_mcp.db.search import tokenize
+
+
+# Bumped after every committed transaction that touched menu_items. Snapshots
+# remember the generation they were built from and are rebuilt lazily.
+_generation = 0
+
+
+def invalidate() -> None:
+    """Mark every menu snapshot stale (call after Core/bulk writes to menu_items)."""
+    global _generation
+    _generation += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _track_menu_writes(session: Session, _flush_context) -> None:
+    if session.info.get("menu_items_changed"):
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, MenuItem):
+            session.info["menu_items_changed"] = True
+            # Committed with the menu rows; other server processes then drop their snapshots.
+            record_change(session, "menu.changed")
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop("menu_items_changed", False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("menu_items_changed", None)
+
+
+@dataclass(frozen=True, slots=True)
+class MenuSnapshot:
+    """Immutable view of menu_items sorted by (name, size)."""
+
+    generation: int
+    version: str
+    items: tuple[Dict[str, Any], ...]
+    # Lowercased names aligned with items, for substring filtering.
+    names: tuple[str, ...]
+    by_id: Dict[uuid.UUID, Dict[str, Any]] = field(repr=False)
+    # Every token of name/description/size, used to correct typos in menu searches.
+    vocabulary: frozenset[str] = field(default=frozenset(), repr=False)
+
+    def list(self, name: Optional[str] = None, only_active: bool = True) -> list[Dict[str, Any]]:
+        needle = name.lower() if name else None
+        return [
+            item
+            for item, item_name in zip(self.items, self.names)
+            if (not only_active or item["is_active"]) and (needle is None or needle in item_name)
+        ]
+
+
+class MenuCatalog:
+    """Process-local menu snapshot, rebuilt only when menu rows change.
+
+    Changes committed by other server processes arrive through the change
+    feed (events/change_feed.py), which calls invalidate().
+    """
+
+    def __init__(self, serialize: Callable[[MenuItem], Dict[str, Any]]):
+        self._serialize = serialize
+        self._snapshot: Optional[MenuSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    async def snapshot(self) -> MenuSnapshot:
+        snap = self._snapshot
+        if snap is not None and snap.generation == _generation:
+            return snap
+        async with self._lock:
+            snap = self._snapshot
+            if snap is None or snap.generation != _generation:
+                snap = await self._load()
+                self._snapshot = snap
+            return snap
+
+    async def _load(self) -> MenuSnapshot:
+        generation = _generation
+        async with get_async_session() as session:
+            rows = (await session.exec(select(MenuItem).order_by(MenuItem.name, MenuItem.size))).all()
+        items = tuple(self._serialize(mi) for mi in rows)
+        version = hashlib.sha1(json.dumps(items, sort_keys=True).encode()).hexdigest()[:16]
+        return MenuSnapshot(
+            generation=generation,
+            version=version,
+            items=items,
+            names=tuple(mi.name.lower() for mi in rows),
+            by_id={mi.id: item for mi, item in zip(rows, items)},
+            vocabulary=frozenset(
+                token for mi in rows for value in (mi.name, mi.description, mi.size) for token in tokenize(value)
+            ),
+        )
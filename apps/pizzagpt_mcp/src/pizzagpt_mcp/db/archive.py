@@ -0,0 +1,100 @@
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, insert, literal
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pizzagpt_mcp.db.change_log import purge_change_events
+from pizzagpt_mcp.db.idempotency import purge_expired_keys
+from pizzagpt_mcp.db.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, OrderStatus
+from pizzagpt_mcp.db.write_queue import run_write
+
+# Orders in a terminal status that were placed more than this many days ago
+# are moved to orders_archive/order_items_archive by archive_orders().
+ORDER_RETENTION_DAYS = int(os.getenv("ORDER_RETENTION_DAYS", "180"))
+# Orders moved per transaction; small enough to keep each write short and
+# the IN (...) lists below the bound-parameter limits.
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+MAX_ARCHIVE_BATCH_SIZE = 5000
+
+TERMINAL_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELED)
+
+_ORDER_COLUMNS = [c.name for c in Order.__table__.columns]
+_ITEM_COLUMNS = [c.name for c in OrderItem.__table__.columns]
+
+
+async def _archive_batch(session: AsyncSession, cutoff: datetime, batch_size: int) -> Dict[str, Any]:
+    """Move up to batch_size orders (oldest first) and their items; flush only."""
+    ids = (await session.exec(
+        select(Order.id)
+        .where(Order.status.in_(TERMINAL_STATUSES), Order.created_at < cutoff)
+        .order_by(Order.created_at)
+        .limit(batch_size)
+    )).all()
+    if not ids:
+        return {"ok": True, "orders": 0, "items": 0}
+    await session.exec(insert(ArchivedOrder).from_select(
+        [*_ORDER_COLUMNS, "archived_at"],
+        select(*Order.__table__.columns, literal(datetime.utcnow())).where(Order.id.in_(ids)),
+    ))
+    items = await session.exec(insert(ArchivedOrderItem).from_select(
+        _ITEM_COLUMNS,
+        select(*OrderItem.__table__.columns).where(OrderItem.order_id.in_(ids)),
+    ))
+    await session.exec(
+        delete(OrderItem).where(OrderItem.order_id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    await session.exec(delete(Order).where(Order.id.in_(ids)).execution_options(synchronize_session=False))
+    return {"ok": True, "orders": len(ids), "items": items.rowcount}
+
+
+async def archive_orders(
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Move COMPLETED/CANCELED orders older than the retention window to the archive tables.
+
+    Each batch is its own write job (see run_write), so the hot tables stay
+    writable while a large backlog is archived and an interrupted run can
+    simply be restarted. Archived orders stay readable through orders.get
+    and keep counting in the sales rollups. Expired idempotency keys and
+    change_events (multi-worker change feed) are deleted as well.
+    """
+    retention_days = ORDER_RETENTION_DAYS if retention_days is None else int(retention_days)
+    batch_size = max(1, min(int(batch_size or ARCHIVE_BATCH_SIZE), MAX_ARCHIVE_BATCH_SIZE))
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    async def _write(session: AsyncSession) -> Dict[str, Any]:
+        return await _archive_batch(session, cutoff, batch_size)
+
+    orders = items = batches = 0
+    while max_batches is None or batches < max_batches:
+        result = await run_write(_write)
+        if not result["orders"]:
+            break
+        orders += result["orders"]
+        items += result["items"]
+        batches += 1
+        if result["orders"] < batch_size:
+            break
+
+    async def _purge(session: AsyncSession) -> Dict[str, Any]:
+        return {
+            "ok": True,
+            "idempotency_keys": await purge_expired_keys(session),
+            "change_events": await purge_change_events(session),
+        }
+
+    purged = await run_write(_purge)
+    return {
+        "ok": True,
+        "cutoff": cutoff.isoformat(),
+        "archived_orders": orders,
+        "archived_items": items,
+        "batches": batches,
+        "purged_idempotency_keys": purged["idempotency_keys"],
+        "purged_change_events": purged["change_events"],
+    }
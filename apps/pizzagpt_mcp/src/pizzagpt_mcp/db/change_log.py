@@ -0,0 +1,38 @@
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pizzagpt_mcp.db.models import ChangeEvent
+
+# Several server processes (launcher.py --workers > 1, or asgi:app under another
+# process manager with PIZZAGPT_CHANGE_FEED=1) share nothing in memory. Each
+# order or menu change is then also written to change_events, in the same
+# transaction, and every process replays the events of the others (see
+# events/change_feed.py).
+CHANGE_FEED_ENABLED = os.getenv("PIZZAGPT_CHANGE_FEED", "0") in ("1", "true", "yes")
+# Events older than this are deleted by purge_change_events (run by the archive job).
+CHANGE_EVENT_RETENTION_SECONDS = int(os.getenv("CHANGE_EVENT_RETENTION_SECONDS", "3600"))
+
+
+def record_change(
+        session: Union[Session, AsyncSession],
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        client_id: Optional[str] = None,
+) -> None:
+    """Add a change event to the caller's transaction; a no-op in a single process."""
+    if CHANGE_FEED_ENABLED:
+        session.add(ChangeEvent(kind=kind, client_id=client_id, payload=payload))
+
+
+async def purge_change_events(session: AsyncSession) -> int:
+    """Delete events past CHANGE_EVENT_RETENTION_SECONDS; flush only."""
+    cutoff = datetime.utcnow() - timedelta(seconds=CHANGE_EVENT_RETENTION_SECONDS)
+    result = await session.exec(
+        delete(ChangeEvent).where(ChangeEvent.created_at < cutoff).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
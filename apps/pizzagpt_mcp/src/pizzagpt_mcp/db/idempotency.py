@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pizzagpt_mcp.cache import TTLCache
+from pizzagpt_mcp.db.database import get_async_session
+from pizzagpt_mcp.db.models import IdempotencyKey
+from pizzagpt_mcp.db.write_queue import WriteJob, run_write
+
+# How long a key replays its first result, and how many keys stay in memory.
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+
+# (tool, key) -> (request hash, response) for recently completed calls.
+_recent: TTLCache[tuple[str, Dict[str, Any]]] = TTLCache(IDEMPOTENCY_CACHE_SIZE, IDEMPOTENCY_TTL_SECONDS)
+# Serializes concurrent calls that share a key, so a retry waits for the original.
+# (tool, key) -> [lock, calls holding or waiting for it]; dropped when that reaches 0.
+_locks: Dict[tuple[str, str], list] = {}
+
+
+def request_hash(args: Dict[str, Any]) -> str:
+    payload = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _replay(key: str, digest: str, stored_hash: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    if stored_hash != digest:
+        return {"ok": False, "error": f"idempotency_key {key!r} was already used with different arguments"}
+    return {**response, "replayed": True}
+
+
+def _live(row: Optional[IdempotencyKey]) -> bool:
+    return row is not None and row.created_at >= datetime.utcnow() - timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+
+
+async def purge_expired_keys(session: AsyncSession) -> int:
+    """Delete keys older than IDEMPOTENCY_TTL_SECONDS (they no longer replay); flush only."""
+    cutoff = datetime.utcnow() - timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+    result = await session.exec(
+        delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def run_idempotent(tool: str, key: Optional[str], args: Dict[str, Any], job: WriteJob) -> Dict[str, Any]:
+    """Run a write job at most once per (tool, idempotency key).
+
+    The first successful result is stored in idempotency_keys in the same
+    transaction as the job's writes; later calls with the same key and
+    arguments get that result back (with "replayed": True) from an in-process
+    LRU, or from the table, without running the job again. Without a key
+    this is just run_write(job).
+    """
+    if not key:
+        return await run_write(job)
+    digest = request_hash(args)
+    cache_key = (tool, key)
+    stored: Dict[str, Any] = {}
+
+    async def _write(session: AsyncSession) -> Dict[str, Any]:
+        row = await session.get(IdempotencyKey, cache_key)
+        if _live(row):
+            stored.update(hash=row.request_hash, response=row.response)
+            return _replay(key, digest, row.request_hash, row.response)
+        result = await job(session)
+        if result.get("ok") is not False:
+            if row is None:
+                row = IdempotencyKey(tool=tool, key=key, request_hash=digest, response=result)
+            else:  # expired: reuse the key for this call
+                row.request_hash, row.response, row.created_at = digest, result, datetime.utcnow()
+            session.add(row)
+            await session.flush()
+            stored.update(hash=digest, response=result)
+        return result
+
+    entry = _locks.setdefault(cache_key, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            cached = _recent.get(cache_key)
+            if cached is not None:
+                return _replay(key, digest, *cached)
+            try:
+                result = await run_write(_write)
+            except IntegrityError:
+                # Another process stored the key first; replay its result.
+                async with get_async_session() as session:
+                    row = await session.get(IdempotencyKey, cache_key)
+                if not _live(row):
+                    raise
+                stored.update(hash=row.request_hash, response=row.response)
+                result = _replay(key, digest, row.request_hash, row.response)
+            if stored:
+                _recent.set(cache_key, (stored["hash"], stored["response"]))
+            return result
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _locks[cache_key]
@@ -0,0 +1,83 @@
+from typing import Callable, List
+
+from sqlalchemy import Connection, Engine, bindparam, inspect, select, update
+
+from pizzagpt_mcp.db.models.customer import Customer, normalize_email, normalize_phone
+
+# Columns added to tables that already existed in earlier releases.
+# create_all only creates missing tables, so init_db runs these upgrades
+# (each a no-op once applied) before building indexes on the new columns.
+
+
+def _columns(conn: Connection, table: str) -> set[str]:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def _add_order_item_unit_price(conn: Connection) -> None:
+    """order_items.unit_price_cents (menu price snapshotted on each line)."""
+    if "unit_price_cents" in _columns(conn, "order_items"):
+        return
+    conn.exec_driver_sql("ALTER TABLE order_items ADD COLUMN unit_price_cents INTEGER NOT NULL DEFAULT 0")
+    # Derive it from the stored line total: totals are recomputed from
+    # unit_price_cents * quantity, so a 0 here would zero out old lines.
+    conn.exec_driver_sql(
+        "UPDATE order_items SET unit_price_cents = line_total_cents / quantity WHERE quantity > 0"
+    )
+    print("Migrated order_items: added unit_price_cents.")
+
+
+def _add_customer_contact_keys(conn: Connection) -> None:
+    """customers.email_normalized / phone_e164, the unique lookup keys of find_or_create."""
+    missing = [
+        (name, ddl)
+        for name, ddl in (("email_normalized", "VARCHAR(320)"), ("phone_e164", "VARCHAR(16)"))
+        if name not in _columns(conn, "customers")
+    ]
+    if not missing:
+        return
+    for name, ddl in missing:
+        conn.exec_driver_sql(f"ALTER TABLE customers ADD COLUMN {name} {ddl}")
+    # Backfill with the same normalization as new rows. Customers that share
+    # a normalized email or phone keep their rows; only the oldest gets the
+    # key, so the unique indexes (built afterwards) can be created.
+    table = Customer.__table__
+    seen_emails: set[str] = set()
+    seen_phones: set[str] = set()
+    rows, duplicates = [], 0
+    for cid, email, phone in conn.execute(
+        select(table.c.id, table.c.email, table.c.phone).order_by(table.c.created_at, table.c.id)
+    ):
+        email_key, phone_key = normalize_email(email), normalize_phone(phone)
+        if email_key in seen_emails or phone_key in seen_phones:
+            duplicates += 1
+        if email_key in seen_emails:
+            email_key = None
+        elif email_key:
+            seen_emails.add(email_key)
+        if phone_key in seen_phones:
+            phone_key = None
+        elif phone_key:
+            seen_phones.add(phone_key)
+        rows.append({"b_id": cid, "b_email": email_key, "b_phone": phone_key})
+    if rows:
+        conn.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(email_normalized=bindparam("b_email"), phone_e164=bindparam("b_phone")),
+            rows,
+        )
+    print(f"Migrated customers: added {', '.join(name for name, _ in missing)} "
+          f"({len(rows)} backfilled, {duplicates} duplicate contacts left without a key).")
+
+
+_UPGRADES: List[Callable[[Connection], None]] = [
+    _add_order_item_unit_price,
+    _add_customer_contact_keys,
+]
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Bring tables created by earlier releases up to the current models."""
+    with engine.begin() as conn:
+        for upgrade in _UPGRADES:
+            upgrade(conn)
@@ -3,6 +3,10 @@ from .ingredient import Ingredient
 from .customer import Customer
 from .order import Order, OrderStatus
 from .order_item import OrderItem
+from .order_archive import ArchivedOrder, ArchivedOrderItem
+from .idempotency_key import IdempotencyKey
+from .change_event import ChangeEvent
+from .sales_rollup import DailyCustomerSales, DailyMenuItemSales, DailySales
 
 __all__ = [
     "MenuItem",
@@ -11,4 +15,11 @@ __all__ = [
     "Order",
     "OrderStatus",
     "OrderItem",
+    "ArchivedOrder",
+    "ArchivedOrderItem",
+    "IdempotencyKey",
+    "ChangeEvent",
+    "DailySales",
+    "DailyMenuItemSales",
+    "DailyCustomerSales",
 ]
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import JSON, Column
+from sqlmodel import SQLModel, Field
+
+
+class ChangeEvent(SQLModel, table=True):
+    """One committed change, for server processes other than the writer (see db/change_log.py)."""
+
+    __tablename__ = "change_events"
+    # Ids are never reused after a purge, so pollers can resume from the last id they saw.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(nullable=False, max_length=64, description="e.g. order.status_changed, menu.changed")
+    # MCP client that made the change, for read-your-writes routing in the other processes.
+    client_id: Optional[str] = Field(default=None, max_length=255)
+    payload: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON, nullable=True))
+
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
@@ -1,8 +1,44 @@
+import os
+import re
 import uuid
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import event, inspect, select
 from sqlmodel import SQLModel, Field, Relationship
 
+# Country calling code assumed for phone numbers given without one ("+" or "00" prefix).
+DEFAULT_PHONE_COUNTRY_CODE = os.getenv("DEFAULT_PHONE_COUNTRY_CODE", "1")
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercased, trimmed email used as the customer's unique lookup key."""
+    email = (email or "").strip().lower()
+    return email or None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Best-effort E.164 form (+<country code><number>), or None if it cannot be a phone number."""
+    raw = (phone or "").strip()
+    digits = re.sub(r"\D", "", raw)
+    if raw.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif not (len(digits) == len(DEFAULT_PHONE_COUNTRY_CODE) + 10 and digits.startswith(DEFAULT_PHONE_COUNTRY_CODE)):
+        # National number: drop the trunk prefix and add the default country code.
+        digits = DEFAULT_PHONE_COUNTRY_CODE + digits.lstrip("0")
+    if not 4 <= len(digits) <= 15 or digits.startswith("0"):
+        return None
+    return "+" + digits
+
+
+class ContactConflictError(ValueError):
+    """A changed email or phone number normalizes to another customer's lookup key."""
+
+    def __init__(self, field: str, value: Optional[str]):
+        super().__init__(f"{field} already belongs to another customer: {value}")
+        self.field = field
+
 
 class Customer(SQLModel, table=True):
     __tablename__ = "customers"
@@ -11,6 +47,9 @@ class Customer(SQLModel, table=True):
     name: str = Field(nullable=False, max_length=200, index=True)
     email: Optional[str] = Field(default=None, max_length=320, index=True)
     phone: Optional[str] = Field(default=None, max_length=32, index=True)
+    # Unique lookup keys derived from email/phone (see normalize_email/normalize_phone).
+    email_normalized: Optional[str] = Field(default=None, max_length=320, unique=True, index=True)
+    phone_e164: Optional[str] = Field(default=None, max_length=16, unique=True, index=True)
     loyalty_points: int = Field(default=0, ge=0, nullable=False)
 
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
@@ -18,3 +57,37 @@ class Customer(SQLModel, table=True):
 
     # relationships
     orders: list["Order"] = Relationship(back_populates="customer")
+
+
+# (contact field, lookup key column, normalizer)
+_CONTACT_KEYS = (
+    ("email", "email_normalized", normalize_email),
+    ("phone", "phone_e164", normalize_phone),
+)
+
+
+@event.listens_for(Customer, "before_insert")
+def _normalize_contact(_mapper, _connection, target: Customer) -> None:
+    target.email_normalized = normalize_email(target.email)
+    target.phone_e164 = normalize_phone(target.phone)
+
+
+@event.listens_for(Customer, "before_update")
+def _renormalize_changed_contact(_mapper, connection, target: Customer) -> None:
+    """Recompute the lookup keys of changed contact fields only.
+
+    A key taken by another customer raises ContactConflictError instead of
+    surfacing as an IntegrityError from the unique index.
+    """
+    attrs = inspect(target).attrs
+    for field, key_column, normalize in _CONTACT_KEYS:
+        if not getattr(attrs, field).history.has_changes():
+            continue
+        value = getattr(target, field)
+        key = normalize(value)
+        column = getattr(Customer, key_column)
+        if key is not None and connection.execute(
+            select(Customer.id).where(column == key, Customer.id != target.id).limit(1)
+        ).first():
+            raise ContactConflictError(field, value)
+        setattr(target, key_column, key)
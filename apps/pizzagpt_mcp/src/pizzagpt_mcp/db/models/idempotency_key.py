@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Any, Dict
+from sqlalchemy import JSON, Column
+from sqlmodel import SQLModel, Field
+
+
+class IdempotencyKey(SQLModel, table=True):
+    __tablename__ = "idempotency_keys"
+
+    tool: str = Field(primary_key=True, max_length=100)
+    key: str = Field(primary_key=True, max_length=200)
+    request_hash: str = Field(nullable=False, max_length=64, description="sha256 of the tool arguments")
+    response: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
@@ -1,11 +1,14 @@
 import uuid
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
 class MenuItem(SQLModel, table=True):
     __tablename__ = "menu_items"
+    # Active items in menu order.
+    __table_args__ = (Index("ix_menu_items_is_active_name_size", "is_active", "name", "size"),)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, nullable=False, index=True)
     name: str = Field(index=True, nullable=False, max_length=200)
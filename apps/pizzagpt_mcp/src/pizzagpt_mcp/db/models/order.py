@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from enum import Enum
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -17,9 +18,14 @@ class OrderStatus(str, Enum):
 
 class Order(SQLModel, table=True):
     __tablename__ = "orders"
+    __table_args__ = (
+        # orders.list: newest first (keyset on created_at, id) per customer or per status.
+        Index("ix_orders_customer_id_created_at", "customer_id", "created_at", "id"),
+        Index("ix_orders_status_created_at", "status", "created_at", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, nullable=False, index=True)
-    customer_id: uuid.UUID = Field(foreign_key="customers.id", index=True, nullable=False)
+    customer_id: uuid.UUID = Field(foreign_key="customers.id", nullable=False)
 
     subtotal_cents: int = Field(default=0, ge=0, nullable=False)
     discount_cents: int = Field(default=0, ge=0, nullable=False)
@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field, Relationship
+
+from .order import OrderStatus
+
+# Cold copies of orders/order_items, filled by db/archive.py. The columns
+# mirror the hot tables so rows move with INSERT … SELECT; archived orders
+# are in a terminal status and are never modified again.
+
+
+class ArchivedOrder(SQLModel, table=True):
+    __tablename__ = "orders_archive"
+
+    id: uuid.UUID = Field(primary_key=True, nullable=False)
+    customer_id: uuid.UUID = Field(foreign_key="customers.id", index=True, nullable=False)
+
+    subtotal_cents: int = Field(default=0, nullable=False)
+    discount_cents: int = Field(default=0, nullable=False)
+    tax_cents: int = Field(default=0, nullable=False)
+    total_cents: int = Field(default=0, nullable=False)
+
+    status: OrderStatus = Field(nullable=False)
+    notes: Optional[str] = Field(default=None, max_length=2000)
+
+    created_at: datetime = Field(nullable=False, index=True)
+    updated_at: datetime = Field(nullable=False)
+    archived_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+    # relationships
+    items: list["ArchivedOrderItem"] = Relationship(back_populates="order")
+
+
+class ArchivedOrderItem(SQLModel, table=True):
+    __tablename__ = "order_items_archive"
+
+    id: uuid.UUID = Field(primary_key=True, nullable=False)
+
+    order_id: uuid.UUID = Field(foreign_key="orders_archive.id", index=True, nullable=False)
+    menu_item_id: uuid.UUID = Field(foreign_key="menu_items.id", nullable=False)
+
+    quantity: int = Field(default=1, nullable=False)
+    special_requests: Optional[str] = Field(default=None, max_length=2000)
+    unit_price_cents: int = Field(default=0, nullable=False)
+    line_total_cents: int = Field(default=0, nullable=False)
+
+    # relationships
+    order: "ArchivedOrder" = Relationship(back_populates="items")
@@ -14,6 +14,8 @@ class OrderItem(SQLModel, table=True):
     quantity: int = Field(default=1, ge=1, nullable=False)
     special_requests: Optional[str] = Field(default=None, max_length=2000)
 
+    unit_price_cents: int = Field(default=0, ge=0, nullable=False, description="Menu price snapshotted when ordered")
+
     line_total_cents: int = Field(default=0, ge=0, nullable=False, description="Cached line total for this item")
 
     # relationships
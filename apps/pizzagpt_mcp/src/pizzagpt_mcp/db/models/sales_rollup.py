@@ -0,0 +1,36 @@
+import uuid
+from datetime import date, datetime
+from sqlmodel import SQLModel, Field
+
+# Rollups are bucketed by the UTC day the order was placed, so a later status
+# change (e.g. COMPLETED -> CANCELED) always adjusts the same bucket.
+
+
+class DailySales(SQLModel, table=True):
+    __tablename__ = "sales_daily"
+
+    day: date = Field(primary_key=True)
+    orders_completed: int = Field(default=0, nullable=False)
+    orders_canceled: int = Field(default=0, nullable=False)
+    revenue_cents: int = Field(default=0, nullable=False, description="Sum of total_cents of completed orders")
+    items_sold: int = Field(default=0, nullable=False)
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class DailyMenuItemSales(SQLModel, table=True):
+    __tablename__ = "sales_daily_menu_items"
+
+    day: date = Field(primary_key=True)
+    menu_item_id: uuid.UUID = Field(primary_key=True)
+    quantity: int = Field(default=0, nullable=False)
+    revenue_cents: int = Field(default=0, nullable=False, description="Sum of line_total_cents (before discount/tax)")
+
+
+class DailyCustomerSales(SQLModel, table=True):
+    __tablename__ = "sales_daily_customers"
+
+    day: date = Field(primary_key=True)
+    customer_id: uuid.UUID = Field(primary_key=True)
+    orders_completed: int = Field(default=0, nullable=False)
+    revenue_cents: int = Field(default=0, nullable=False)
@@ -0,0 +1,36 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset values (datetimes, UUIDs, scalars) as an opaque URL-safe cursor."""
+    parts = []
+    for v in values:
+        if isinstance(v, datetime):
+            parts.append(v.isoformat())
+        elif isinstance(v, uuid.UUID):
+            parts.append(str(v))
+        else:
+            parts.append(v)
+    raw = json.dumps(parts, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> list[Any]:
+    """Decode a cursor from encode_cursor(); raises ValueError if it is malformed.
+
+    With ``types``, the cursor must hold exactly one value of each type, in order.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        parts = json.loads(raw)
+    except Exception as exc:
+        raise ValueError(f"invalid cursor: {cursor}") from exc
+    if not isinstance(parts, list):
+        raise ValueError(f"invalid cursor: {cursor}")
+    if types and (len(parts) != len(types) or not all(isinstance(p, t) for p, t in zip(parts, types))):
+        raise ValueError(f"invalid cursor: {cursor}")
+    return parts
@@ -0,0 +1,77 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pizzagpt_mcp.cache import TTLCache
+from pizzagpt_mcp.db.database import async_engine, get_async_read_engine, has_read_replica
+
+# After a client's write commits, its reads stay on the primary for this long.
+# Keep it above the replica's usual replication lag.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+
+@dataclass(slots=True)
+class ReadRoute:
+    """Where one tool call's reads go: the replica unless ``primary`` is set."""
+
+    client: Optional[str] = None
+    primary: bool = False
+
+
+_current: ContextVar[Optional[ReadRoute]] = ContextVar("pizzagpt_read_route", default=None)
+
+# Clients (MCP session ids or X-Client-Id headers) that committed a write in the last READ_YOUR_WRITES_SECONDS.
+_recent_writers: TTLCache[bool] = TTLCache(100_000, READ_YOUR_WRITES_SECONDS)
+
+
+@contextmanager
+def route_call(client: Optional[str]) -> Iterator[ReadRoute]:
+    """Bind the routing state for one tool call made by ``client``."""
+    route = ReadRoute(client=client, primary=client is not None and _recent_writers.get(client) is not None)
+    token = _current.set(route)
+    try:
+        yield route
+    finally:
+        _current.reset(token)
+
+
+def note_write() -> None:
+    """Record a committed write: the rest of this call, and the client's next
+    calls for READ_YOUR_WRITES_SECONDS, read from the primary."""
+    route = _current.get()
+    if route is None or not has_read_replica():
+        return
+    route.primary = True
+    if route.client is not None:
+        _recent_writers.set(route.client, True)
+
+
+def note_client_write(client: str) -> None:
+    """Record a write that another server process committed for ``client``."""
+    if has_read_replica():
+        _recent_writers.set(client, True)
+
+
+def current_client() -> Optional[str]:
+    route = _current.get()
+    return route.client if route is not None else None
+
+
+def reads_from_primary() -> bool:
+    route = _current.get()
+    return not has_read_replica() or (route is not None and route.primary)
+
+
+def get_async_read_session() -> AsyncSession:
+    """Session for read-only tools: the replica, or the primary when there is
+    no replica or the calling client has just written (read-your-writes).
+
+    Sessions that read data a write job is about to change must keep using
+    get_async_session(); replica rows may lag the primary.
+    """
+    bind = async_engine if reads_from_primary() else get_async_read_engine()
+    return AsyncSession(bind, expire_on_commit=False)
@@ -0,0 +1,177 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, Engine, case, cast, delete, func, insert as core_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pizzagpt_mcp.db.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    DailyCustomerSales,
+    DailyMenuItemSales,
+    DailySales,
+    Order,
+    OrderItem,
+    OrderStatus,
+)
+
+_ROLLUP_TABLES = (DailySales, DailyMenuItemSales, DailyCustomerSales)
+
+
+def _increment(
+        dialect: str,
+        model: type[SQLModel],
+        keys: List[str],
+        counters: List[str],
+        extra: Optional[Dict[str, Any]] = None,
+):
+    """INSERT … ON CONFLICT (keys) DO UPDATE SET counter = counter + excluded.counter."""
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert(model)
+    set_ = {c: getattr(model, c) + getattr(stmt.excluded, c) for c in counters}
+    set_.update(extra or {})
+    return stmt.on_conflict_do_update(index_elements=keys, set_=set_)
+
+
+async def apply_status_change(
+        session: AsyncSession,
+        order: Order,
+        old_status: OrderStatus,
+        new_status: OrderStatus,
+) -> None:
+    """Fold an order's move into or out of COMPLETED/CANCELED into the sales rollups.
+
+    Runs inside the caller's write job (flush only) and needs order.items
+    loaded. Leaving COMPLETED subtracts what entering it added, so
+    corrections keep the rollups exact.
+    """
+    completed = int(new_status == OrderStatus.COMPLETED) - int(old_status == OrderStatus.COMPLETED)
+    canceled = int(new_status == OrderStatus.CANCELED) - int(old_status == OrderStatus.CANCELED)
+    if not (completed or canceled):
+        return
+    dialect = session.bind.dialect.name
+    day = order.created_at.date()
+    await session.exec(
+        _increment(
+            dialect, DailySales, ["day"], ["orders_completed", "orders_canceled", "revenue_cents", "items_sold"],
+            {"updated_at": datetime.utcnow()},
+        ),
+        params={
+            "day": day,
+            "orders_completed": completed,
+            "orders_canceled": canceled,
+            "revenue_cents": completed * order.total_cents,
+            "items_sold": completed * sum(oi.quantity for oi in order.items),
+            "updated_at": datetime.utcnow(),
+        },
+    )
+    if not completed:
+        return
+    per_item: Dict[Any, List[int]] = defaultdict(lambda: [0, 0])
+    for oi in order.items:
+        per_item[oi.menu_item_id][0] += oi.quantity
+        per_item[oi.menu_item_id][1] += oi.line_total_cents
+    if per_item:
+        await session.exec(
+            _increment(dialect, DailyMenuItemSales, ["day", "menu_item_id"], ["quantity", "revenue_cents"]),
+            params=[
+                {"day": day, "menu_item_id": mid, "quantity": completed * q, "revenue_cents": completed * cents}
+                for mid, (q, cents) in per_item.items()
+            ],
+        )
+    await session.exec(
+        _increment(dialect, DailyCustomerSales, ["day", "customer_id"], ["orders_completed", "revenue_cents"]),
+        params={
+            "day": day,
+            "customer_id": order.customer_id,
+            "orders_completed": completed,
+            "revenue_cents": completed * order.total_cents,
+        },
+    )
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _rollup_queries(dialect: str, order_model: type[SQLModel], item_model: type[SQLModel]):
+    """The three GROUP BY queries behind the rollups, over one pair of order tables."""
+    day_col = func.date(order_model.created_at) if dialect == "sqlite" else cast(order_model.created_at, Date)
+    is_completed = order_model.status == OrderStatus.COMPLETED
+    daily_q = (
+        select(
+            day_col,
+            func.sum(case((is_completed, 1), else_=0)),
+            func.sum(case((order_model.status == OrderStatus.CANCELED, 1), else_=0)),
+            func.sum(case((is_completed, order_model.total_cents), else_=0)),
+        )
+        .where(order_model.status.in_([OrderStatus.COMPLETED, OrderStatus.CANCELED]))
+        .group_by(day_col)
+    )
+    items_q = (
+        select(day_col, item_model.menu_item_id, func.sum(item_model.quantity), func.sum(item_model.line_total_cents))
+        .join(order_model, order_model.id == item_model.order_id)
+        .where(is_completed)
+        .group_by(day_col, item_model.menu_item_id)
+    )
+    customers_q = (
+        select(day_col, order_model.customer_id, func.count(), func.sum(order_model.total_cents))
+        .where(is_completed)
+        .group_by(day_col, order_model.customer_id)
+    )
+    return daily_q, items_q, customers_q
+
+
+def rebuild_sales_rollups(engine: Engine) -> None:
+    """Recompute the rollups from orders with one GROUP BY pass per table.
+
+    For data written outside the tools (generate, restore-sql) or to repair
+    drift; O(orders), unlike the incremental path in orders.set_status.
+    Archived orders (db/archive.py) are counted as well.
+    """
+    daily: Dict[date, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    per_item: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+    per_customer: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for order_model, item_model in ((Order, OrderItem), (ArchivedOrder, ArchivedOrderItem)):
+            daily_q, items_q, customers_q = _rollup_queries(engine.dialect.name, order_model, item_model)
+            for d, mid, q, cents in conn.execute(items_q):
+                bucket = per_item[(_as_date(d), mid)]
+                bucket[0] += q
+                bucket[1] += cents
+                daily[_as_date(d)][3] += q
+            for d, done, canceled, revenue in conn.execute(daily_q):
+                bucket = daily[_as_date(d)]
+                bucket[0] += done
+                bucket[1] += canceled
+                bucket[2] += revenue
+            for d, cid, n, revenue in conn.execute(customers_q):
+                bucket = per_customer[(_as_date(d), cid)]
+                bucket[0] += n
+                bucket[1] += revenue
+        daily_rows = [
+            {
+                "day": d, "orders_completed": done, "orders_canceled": canceled,
+                "revenue_cents": revenue, "items_sold": sold, "updated_at": now,
+            }
+            for d, (done, canceled, revenue, sold) in daily.items()
+        ]
+        item_rows = [
+            {"day": d, "menu_item_id": mid, "quantity": q, "revenue_cents": cents}
+            for (d, mid), (q, cents) in per_item.items()
+        ]
+        customer_rows = [
+            {"day": d, "customer_id": cid, "orders_completed": n, "revenue_cents": revenue}
+            for (d, cid), (n, revenue) in per_customer.items()
+        ]
+        for model, rows in zip(_ROLLUP_TABLES, (daily_rows, item_rows, customer_rows)):
+            conn.execute(delete(model))
+            if rows:
+                conn.execute(core_insert(model), rows)
+    print(f"Rebuilt sales rollups: {len(daily_rows)} days, {len(item_rows)} item buckets, "
+          f"{len(customer_rows)} customer buckets.")
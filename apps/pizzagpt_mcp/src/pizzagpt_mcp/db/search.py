@@ -0,0 +1,126 @@
+import difflib
+import re
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Engine, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Relative weight of matches in name, description and size when ranking.
+_WEIGHTS = (10.0, 2.0, 1.0)
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS menu_items_fts USING fts5(
+        name, description, size,
+        content='menu_items', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_ai AFTER INSERT ON menu_items BEGIN
+        INSERT INTO menu_items_fts(rowid, name, description, size)
+        VALUES (new.rowid, new.name, new.description, new.size);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_ad AFTER DELETE ON menu_items BEGIN
+        INSERT INTO menu_items_fts(menu_items_fts, rowid, name, description, size)
+        VALUES ('delete', old.rowid, old.name, old.description, old.size);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_au AFTER UPDATE ON menu_items BEGIN
+        INSERT INTO menu_items_fts(menu_items_fts, rowid, name, description, size)
+        VALUES ('delete', old.rowid, old.name, old.description, old.size);
+        INSERT INTO menu_items_fts(rowid, name, description, size)
+        VALUES (new.rowid, new.name, new.description, new.size);
+    END
+    """,
+]
+
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE menu_items ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(size, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_menu_items_search_vector ON menu_items USING gin (search_vector)",
+]
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return _TOKEN.findall(value.lower()) if value else []
+
+
+def install_search_index(engine: Engine) -> None:
+    """Create the menu search index and the hooks that keep it in sync with menu_items.
+
+    SQLite uses an external-content FTS5 table maintained by triggers; Postgres
+    uses a generated, GIN-indexed tsvector column. Other dialects are skipped.
+    """
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            exists = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'menu_items_fts'"
+            ).first()
+            for ddl in _SQLITE_DDL:
+                conn.exec_driver_sql(ddl)
+            if not exists:
+                # Index rows that were written before the triggers existed.
+                conn.exec_driver_sql("INSERT INTO menu_items_fts(menu_items_fts) VALUES ('rebuild')")
+        elif dialect == "postgresql":
+            for ddl in _POSTGRES_DDL:
+                conn.exec_driver_sql(ddl)
+
+
+def correct_terms(query: str, vocabulary: Iterable[str]) -> List[str]:
+    """Map query tokens onto indexed terms, fixing typos; unknown words are dropped.
+
+    A token is kept when it is an indexed term or a prefix of one; otherwise the
+    closest indexed term (difflib ratio >= 0.75) replaces it.
+    """
+    vocab = sorted(set(vocabulary))
+    terms: List[str] = []
+    for token in tokenize(query):
+        if any(term.startswith(token) for term in vocab):
+            terms.append(token)
+            continue
+        close = difflib.get_close_matches(token, vocab, n=1, cutoff=0.75)
+        if close:
+            terms.append(close[0])
+    return list(dict.fromkeys(terms))
+
+
+async def search_menu_ids(
+        session: AsyncSession,
+        terms: List[str],
+        limit: int = 10,
+        only_active: bool = True,
+) -> List[Tuple[uuid.UUID, float]]:
+    """Return (menu item id, score) pairs for the best matches of any term, best first."""
+    if not terms:
+        return []
+    active = " AND m.is_active" if only_active else ""
+    bind = session.bind
+    if bind.dialect.name == "postgresql":
+        stmt = text(
+            "SELECT m.id, ts_rank('{0.1, 0.2, 0.4, 1.0}', m.search_vector, q) AS score "
+            "FROM menu_items m, to_tsquery('simple', :q) q "
+            f"WHERE m.search_vector @@ q{active} ORDER BY score DESC LIMIT :limit"
+        )
+        q = " | ".join(f"{t}:*" for t in terms)
+    else:
+        stmt = text(
+            f"SELECT m.id, -bm25(menu_items_fts, {', '.join(map(str, _WEIGHTS))}) AS score "
+            "FROM menu_items_fts JOIN menu_items m ON m.rowid = menu_items_fts.rowid "
+            f"WHERE menu_items_fts MATCH :q{active} ORDER BY score DESC LIMIT :limit"
+        )
+        q = " OR ".join(f'"{t}"*' for t in terms)
+    rows = await session.exec(stmt, params={"q": q, "limit": limit})
+    return [(uuid.UUID(str(mid)), float(score)) for mid, score in rows.all()]
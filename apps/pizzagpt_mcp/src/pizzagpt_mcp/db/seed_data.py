@@ -1,24 +1,76 @@
 import argparse
+import asyncio
 import os
-from sqlmodel import Session, select
+import random
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import Any, Iterator, TextIO
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
 
 from pizzagpt_mcp.db import database
+from pizzagpt_mcp.db.archive import archive_orders
 from pizzagpt_mcp.db.models import *  # type: ignore
+from pizzagpt_mcp.db.models.customer import normalize_email, normalize_phone
+from pizzagpt_mcp.db.rollups import rebuild_sales_rollups
+from pizzagpt_mcp.db.write_queue import close_write_queue
 
 
 # Build parser but don't execute it at import time
 _parser = argparse.ArgumentParser(description="DB init and seed/restore")
 _parser.add_argument(
     "--mode",
-    choices=["seed", "restore-sql", "auto"],
+    choices=["seed", "restore-sql", "backup", "generate", "migrate", "rollups", "archive", "auto"],
     default="auto",
-    help="seed: ORM seed; restore-sql: import .sql; auto: restore if dump exists else seed",
+    help=(
+        "seed: ORM seed; restore-sql: import .sql; backup: online snapshot of the SQLite DB; "
+        "generate: bulk synthetic data for load tests; migrate: create tables only; "
+        "rollups: rebuild the sales report tables from orders; "
+        "archive: move old completed/canceled orders to the archive tables; "
+        "auto: restore if dump exists else seed"
+    ),
 )
 _parser.add_argument(
     "--dump",
     default=os.getenv("DB_SQL_DUMP", "seed_dump.sql"),
     help="Path to SQL dump file for restore-sql/auto",
 )
+_parser.add_argument(
+    "--batch-size",
+    type=int,
+    default=int(os.getenv("DB_RESTORE_BATCH_SIZE", "1000")),
+    help="Statements per transaction when restoring a SQL dump",
+)
+_parser.add_argument(
+    "--backup-path",
+    default=os.getenv("DB_BACKUP_PATH", "pizzagpt_backup.db"),
+    help="Destination file for backup mode",
+)
+_parser.add_argument("--customers", type=int, default=1000, help="generate: number of customers")
+_parser.add_argument("--menu-items", type=int, default=40, help="generate: number of menu items")
+_parser.add_argument("--orders", type=int, default=10000, help="generate: number of orders")
+_parser.add_argument("--items-per-order", type=int, default=4, help="generate: maximum items per order")
+_parser.add_argument("--seed", type=int, default=42, help="generate: random seed for reproducible data")
+_parser.add_argument(
+    "--reset",
+    action="store_true",
+    help="generate: delete all existing rows first (generate refuses to add to non-empty tables otherwise)",
+)
+_parser.add_argument(
+    "--retention-days",
+    type=int,
+    default=None,
+    help="archive: archive finished orders placed more than this many days ago (default ORDER_RETENTION_DAYS)",
+)
+_parser.add_argument(
+    "--backup-pages",
+    type=int,
+    default=-1,
+    help="Pages copied per backup step (-1: whole database in one consistent step)",
+)
 
 
 def already_seeded(session: Session) -> bool:
@@ -74,8 +126,10 @@ def seed_with_orm():
         order1.discount_cents = 0
         order1.tax_cents = int(round(order1.subtotal_cents * 0.08))
         order1.total_cents = order1.subtotal_cents - order1.discount_cents + order1.tax_cents
-        oi1.line_total_cents = margherita_l.price_cents * oi1.quantity
-        oi2.line_total_cents = pepperoni_m.price_cents * oi2.quantity
+        oi1.unit_price_cents = margherita_l.price_cents
+        oi1.line_total_cents = oi1.unit_price_cents * oi1.quantity
+        oi2.unit_price_cents = pepperoni_m.price_cents
+        oi2.line_total_cents = oi2.unit_price_cents * oi2.quantity
         session.add_all([oi1, oi2])
 
         order2 = Order(customer_id=bob.id, status=OrderStatus.PREPARING)
@@ -87,38 +141,264 @@ def seed_with_orm():
         order2.discount_cents = 100
         order2.tax_cents = int(round((order2.subtotal_cents - order2.discount_cents) * 0.08))
         order2.total_cents = order2.subtotal_cents - order2.discount_cents + order2.tax_cents
-        oi3.line_total_cents = funghi_m.price_cents * oi3.quantity
-        oi4.line_total_cents = margherita_s.price_cents * oi4.quantity
+        oi3.unit_price_cents = funghi_m.price_cents
+        oi3.line_total_cents = oi3.unit_price_cents * oi3.quantity
+        oi4.unit_price_cents = margherita_s.price_cents
+        oi4.line_total_cents = oi4.unit_price_cents * oi4.quantity
         session.add_all([oi3, oi4])
 
         session.commit()
         print("Seeded via ORM.")
 
 
-def restore_from_sql(dump_path: str):
-    # ensure DB file exists/initialized before restore path resolution
+_FIRST_NAMES = [
+    "Alice", "Bob", "Carla", "David", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+    "Kara", "Luca", "Maya", "Nils", "Olga", "Pedro", "Quinn", "Rosa", "Sven", "Tara",
+]
+_LAST_NAMES = [
+    "Johnson", "Smith", "Garcia", "Müller", "Rossi", "Kim", "Nguyen", "Novak", "Silva", "Weber",
+    "Brown", "Dubois", "Ivanova", "Khan", "Larsen", "Moreau", "Ortiz", "Sato", "Tanaka", "Young",
+]
+_PIZZAS = [
+    ("Margherita", "Tomato, mozzarella, basil"),
+    ("Pepperoni", "Tomato, mozzarella, pepperoni"),
+    ("Funghi", "Tomato, mozzarella, mushrooms"),
+    ("Quattro Formaggi", "Mozzarella, gorgonzola, parmesan, fontina"),
+    ("Diavola", "Tomato, mozzarella, spicy salami, chili"),
+    ("Hawaii", "Tomato, mozzarella, ham, pineapple"),
+    ("Capricciosa", "Tomato, mozzarella, ham, mushrooms, artichokes, olives"),
+    ("Marinara", "Tomato, garlic, oregano"),
+    ("Prosciutto", "Tomato, mozzarella, prosciutto, arugula"),
+    ("Vegetariana", "Tomato, mozzarella, peppers, onions, zucchini"),
+]
+_SIZES = [("10in", 0.8), ("12in", 1.0), ("14in", 1.2), ("16in", 1.45)]
+_CHUNK_ROWS = 10_000
+# Tables generate_synthetic fills; it does not add to them when they already have rows.
+_GENERATED_MODELS = (MenuItem, Customer, Order, OrderItem)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _insert_chunks(conn, model, rows: list[dict[str, Any]]) -> None:
+    for i in range(0, len(rows), _CHUNK_ROWS):
+        conn.execute(insert(model.__table__), rows[i:i + _CHUNK_ROWS])
+
+
+def _reset_tables(conn) -> None:
+    """Delete every row of every table, referencing tables first."""
+    for table in reversed(SQLModel.metadata.sorted_tables):
+        conn.execute(table.delete())
+
+
+def generate_synthetic(
+        n_customers: int,
+        n_menu_items: int,
+        n_orders: int,
+        max_items_per_order: int,
+        seed: int = 42,
+        reset: bool = False,
+):
+    """Bulk-insert reproducible synthetic customers, menu items and orders for load testing.
+
+    Rows are written with Core executemany INSERTs in chunks rather than ORM
+    objects. Menu popularity and customer activity are skewed (a few items and
+    regulars dominate), and order age determines how likely it is to be finished.
+
+    Raises RuntimeError if the tables already have rows, unless reset deletes
+    every row of the database first.
+    """
     database.init_db()
-    import sqlite3
+    with database.get_engine().begin() as conn:
+        if reset:
+            _reset_tables(conn)
+            print("Deleted all existing rows.")
+        else:
+            filled = [m.__tablename__ for m in _GENERATED_MODELS if conn.execute(select(m.id).limit(1)).first()]
+            if filled:
+                raise RuntimeError(
+                    f"generate needs empty tables, but {', '.join(filled)} already have rows; "
+                    "use a fresh database or pass --reset to delete all existing rows first"
+                )
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+
+    menu_rows = []
+    for i in range(n_menu_items):
+        name, description = _PIZZAS[i // len(_SIZES) % len(_PIZZAS)]
+        if i >= len(_PIZZAS) * len(_SIZES):
+            name = f"{name} Special {i // (len(_PIZZAS) * len(_SIZES))}"
+        size, factor = _SIZES[i % len(_SIZES)]
+        menu_rows.append({
+            "id": _uuid(rng), "name": name, "description": description, "size": size,
+            "price_cents": int(rng.randint(799, 1199) * factor), "is_active": rng.random() > 0.05,
+            "created_at": now, "updated_at": now,
+        })
+    active_menu = [m for m in menu_rows if m["is_active"]] or menu_rows
+    # Zipf-like popularity: the first items on the shuffled menu sell the most.
+    rng.shuffle(active_menu)
+    menu_weights = [1 / (rank + 1) for rank in range(len(active_menu))]
+
+    customer_rows = []
+    for i in range(n_customers):
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        email, phone = f"{first}.{last}.{i}@example.com".lower(), f"+1555{i:07d}"
+        customer_rows.append({
+            "id": _uuid(rng), "name": f"{first} {last}",
+            "email": email, "phone": phone,
+            "email_normalized": normalize_email(email), "phone_e164": normalize_phone(phone),
+            "loyalty_points": 0, "created_at": now, "updated_at": now,
+        })
+
+    with database.get_engine().begin() as conn:
+        _insert_chunks(conn, MenuItem, menu_rows)
+        _insert_chunks(conn, Customer, customer_rows)
+    print(f"Generated {n_menu_items} menu items and {n_customers} customers.")
+
+    regulars = customer_rows[:max(1, n_customers // 10)]
+    terminal = [OrderStatus.COMPLETED] * 18 + [OrderStatus.CANCELED]
+    active = [OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY, OrderStatus.DELIVERING]
+    generated = 0
+    while generated < n_orders:
+        order_rows: list[dict[str, Any]] = []
+        item_rows: list[dict[str, Any]] = []
+        for _ in range(min(_CHUNK_ROWS, n_orders - generated)):
+            # Half of all orders come from the 10% of customers who are regulars.
+            customer = rng.choice(regulars) if rng.random() < 0.5 else rng.choice(customer_rows)
+            age = timedelta(days=rng.expovariate(1 / 90), seconds=rng.randint(0, 86_399))
+            created_at = now - age
+            status = rng.choice(active) if age < timedelta(hours=2) else rng.choice(terminal)
+            order_id = _uuid(rng)
+            subtotal = 0
+            for menu_item in rng.choices(active_menu, menu_weights, k=rng.randint(1, max(1, max_items_per_order))):
+                quantity = 1 if rng.random() < 0.8 else rng.randint(2, 4)
+                line_total = menu_item["price_cents"] * quantity
+                subtotal += line_total
+                item_rows.append({
+                    "id": _uuid(rng), "order_id": order_id, "menu_item_id": menu_item["id"],
+                    "quantity": quantity, "special_requests": None,
+                    "unit_price_cents": menu_item["price_cents"], "line_total_cents": line_total,
+                })
+            discount = 100 * rng.randint(1, 5) if rng.random() < 0.1 else 0
+            tax = int(round(max(0, subtotal - discount) * 0.08))
+            order_rows.append({
+                "id": order_id, "customer_id": customer["id"], "subtotal_cents": subtotal,
+                "discount_cents": discount, "tax_cents": tax, "total_cents": subtotal - discount + tax,
+                "status": status, "notes": None, "created_at": created_at, "updated_at": created_at,
+            })
+        with database.get_engine().begin() as conn:
+            _insert_chunks(conn, Order, order_rows)
+            _insert_chunks(conn, OrderItem, item_rows)
+        generated += len(order_rows)
+        rate = generated / (time.perf_counter() - started)
+        print(f"  {generated}/{n_orders} orders ({rate:.0f}/s)")
+    print(f"Generated {n_orders} orders in {time.perf_counter() - started:.1f}s.")
+    rebuild_sales_rollups(database.get_engine())
 
+
+def _sqlite_db_path() -> str:
     url = str(database.get_engine().url)
     if url.startswith("sqlite:///"):
-        db_path = url.replace("sqlite:///", "", 1)
+        return url.replace("sqlite:///", "", 1)
     elif url.startswith("sqlite:////"):
-        db_path = url.replace("sqlite:////", "/", 1)
-    else:
-        raise RuntimeError("SQL restore currently supports SQLite only in this helper.")
+        return url.replace("sqlite:////", "/", 1)
+    raise RuntimeError("SQL restore/backup currently supports SQLite only in this helper.")
+
+
+# Transaction control in the dump is replaced by our own batched commits.
+_SKIPPED_STATEMENTS = ("BEGIN TRANSACTION;", "BEGIN;", "COMMIT;", "END TRANSACTION;")
+
+
+def _iter_sql_statements(f: TextIO) -> Iterator[str]:
+    """Yield complete SQL statements from a dump without reading it all into memory."""
+    buf: list[str] = []
+    for line in f:
+        buf.append(line)
+        # Cheap pre-check before asking SQLite whether the statement is complete.
+        if not line.rstrip().endswith(";"):
+            continue
+        stmt = "".join(buf)
+        if sqlite3.complete_statement(stmt):
+            buf.clear()
+            yield stmt
+    tail = "".join(buf).strip()
+    if tail:
+        yield tail
+
+
+def restore_from_sql(dump_path: str, batch_size: int = 1000):
+    # ensure DB file exists/initialized before restore path resolution
+    database.init_db()
+    db_path = _sqlite_db_path()
 
     if not os.path.exists(dump_path):
         raise FileNotFoundError(f"Dump not found: {dump_path}")
 
+    total_bytes = os.path.getsize(dump_path) or 1
     print(f"Restoring from SQL dump: {dump_path} -> {db_path}")
-    with sqlite3.connect(db_path) as conn, open(dump_path, "r", encoding="utf-8") as f:
-        sql = f.read()
-        conn.executescript(sql)
-    print("SQL restore completed.")
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        statements = 0
+        started = time.perf_counter()
+        conn.execute("BEGIN")
+        with open(dump_path, "r", encoding="utf-8") as f:
+            for stmt in _iter_sql_statements(f):
+                if stmt.strip().upper() in _SKIPPED_STATEMENTS:
+                    continue
+                conn.execute(stmt)
+                statements += 1
+                if statements % batch_size == 0:
+                    conn.execute("COMMIT")
+                    conn.execute("BEGIN")
+                    pct = 100 * f.buffer.tell() / total_bytes
+                    rate = statements / (time.perf_counter() - started)
+                    print(f"  {statements} statements ({pct:.1f}%, {rate:.0f}/s)")
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    print(f"SQL restore completed: {statements} statements.")
+    rebuild_sales_rollups(database.get_engine())
+
+
+def backup_sqlite(backup_path: str, pages: int = -1):
+    """Take a consistent snapshot of the live SQLite database with the online backup API.
+
+    With pages=-1 the copy runs in one step under a read transaction, which
+    does not block writers when the database is in WAL mode.
+    """
+    db_path = _sqlite_db_path()
+    print(f"Backing up SQLite DB: {db_path} -> {backup_path}")
+
+    def progress(_status, remaining, total):
+        print(f"  {total - remaining}/{total} pages")
 
+    # sqlite3's own context manager only ends the transaction; closing() releases the files.
+    with closing(sqlite3.connect(db_path)) as src, closing(sqlite3.connect(backup_path)) as dst:
+        src.backup(dst, pages=pages, progress=progress)
+    print("Backup completed.")
 
-def run_seed_or_restore(argv: list[str] | None = None):
+
+async def _archive(retention_days: int | None) -> dict[str, Any]:
+    try:
+        return await archive_orders(retention_days)
+    finally:
+        await close_write_queue()
+        await database.dispose_async_engines()
+
+
+def run_seed_or_restore(argv: list[str] | None = None) -> str:
+    """Run the requested --mode and return it.
+
+    archive runs its own event loop here; from inside a running loop (main.py)
+    use run_seed_or_restore_async instead. Callers exit after archive mode
+    rather than starting the server.
+    """
     # Parse only when explicitly called
     args = _parser.parse_args(argv)
 
@@ -128,9 +408,46 @@ def run_seed_or_restore(argv: list[str] | None = None):
     if mode == "seed":
         seed_with_orm()
     elif mode == "restore-sql":
-        restore_from_sql(dump_path)
+        restore_from_sql(dump_path, args.batch_size)
+    elif mode == "backup":
+        backup_sqlite(args.backup_path, args.backup_pages)
+    elif mode == "generate":
+        try:
+            generate_synthetic(
+                args.customers, args.menu_items, args.orders, args.items_per_order, args.seed, args.reset,
+            )
+        except RuntimeError as exc:
+            _parser.error(str(exc))
+    elif mode == "migrate":
+        database.init_db()
+    elif mode == "rollups":
+        database.init_db()
+        rebuild_sales_rollups(database.get_engine())
+    elif mode == "archive":
+        database.init_db()
+        print(asyncio.run(_archive(args.retention_days)))
     else:  # auto
         if os.path.exists(dump_path):
-            restore_from_sql(dump_path)
+            restore_from_sql(dump_path, args.batch_size)
         else:
             seed_with_orm()
+    return mode
+
+
+async def run_seed_or_restore_async(argv: list[str] | None = None) -> str:
+    """run_seed_or_restore for callers already inside an event loop."""
+    args = _parser.parse_args(argv)
+    if args.mode != "archive":
+        return run_seed_or_restore(argv)
+    database.init_db()
+    print(await archive_orders(args.retention_days))
+    return args.mode
+
+
+def main(argv: list[str] | None = None) -> None:
+    """One-off DB jobs without the server, e.g. a cron'd --mode archive."""
+    run_seed_or_restore(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger("pizzagpt_mcp.sql")
+
+# Queries slower than this are logged together with their query plan.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") not in ("0", "false", "no")
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Queries issued and DB time spent on behalf of one tool call (or a count_queries block)."""
+
+    tool: Optional[str] = None
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("pizzagpt_query_stats", default=None)
+
+# Process-wide totals per tool: [queries, db_seconds]. Read by /metrics.
+tool_totals: Dict[str, list] = defaultdict(lambda: [0, 0.0])
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def bind(stats: Optional[QueryStats]) -> Iterator[Optional[QueryStats]]:
+    """Attribute queries run in this context to stats (used by the write queue for its jobs)."""
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def trace_tool(tool: str) -> Iterator[QueryStats]:
+    """Collect query stats for one tool call and add them to the per-tool totals (also when it fails)."""
+    stats = QueryStats(tool=tool)
+    try:
+        with bind(stats):
+            yield stats
+    finally:
+        totals = tool_totals[tool]
+        totals[0] += stats.queries
+        totals[1] += stats.db_seconds
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count queries in a block, e.g. to assert a tool does not regress into N+1 queries."""
+    with bind(QueryStats()) as stats:
+        yield stats
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    # A raw DBAPI cursor keeps the EXPLAIN itself out of the tracing hooks.
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" | ".join(str(col) for col in row) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def install_query_tracing(sync_engine: Engine) -> None:
+    """Time every statement on the engine and attribute it to the running tool call."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 < SLOW_QUERY_MS:
+            return
+        tool = stats.tool if stats else None
+        plan = ""
+        if SLOW_QUERY_EXPLAIN and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+            try:
+                plan = "\n" + _explain(conn, statement, parameters)
+            except Exception as exc:  # plans are best effort
+                plan = f"\n(explain failed: {exc})"
+        logger.warning("slow query (%.1f ms, tool=%s): %s%s", elapsed * 1000, tool, statement, plan)
@@ -0,0 +1,136 @@
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pizzagpt_mcp.db import tracing
+from pizzagpt_mcp.db.change_log import CHANGE_FEED_ENABLED, record_change
+from pizzagpt_mcp.db.database import get_async_write_session, has_read_replica, write_queue_enabled
+from pizzagpt_mcp.db.read_routing import current_client, note_write
+
+WriteJob = Callable[[AsyncSession], Awaitable[Dict[str, Any]]]
+
+
+class _RollbackJob(Exception):
+    """Raised inside a job's savepoint to discard its changes without failing the batch."""
+
+
+def _succeeded(result: Any) -> bool:
+    # Tools report failures as {"ok": False, ...}; those must not be committed.
+    return not (isinstance(result, dict) and result.get("ok") is False)
+
+
+class WriteQueue:
+    """Serializes writes through a single task and commits them in groups.
+
+    Each job runs in its own SAVEPOINT on a shared session, so a failing job
+    only discards its own changes; the batch is then committed once, letting
+    many small writes share one fsync. Jobs must flush, never commit.
+    """
+
+    def __init__(self, max_batch: int = 64, max_delay: float = 0.002):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[tuple[WriteJob, asyncio.Future, Optional[tracing.QueryStats]]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, job: WriteJob) -> Dict[str, Any]:
+        if self._task is None or self._task.done():
+            # Fresh context so the writer does not inherit the first caller's tracing state.
+            self._task = asyncio.create_task(self._run(), name="pizzagpt-write-queue", context=contextvars.Context())
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, fut, tracing.current_stats()))
+        return await fut
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _next_batch(self) -> list[tuple[WriteJob, asyncio.Future, Optional[tracing.QueryStats]]]:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            done: list[tuple[asyncio.Future, Any]] = []
+            try:
+                async with get_async_write_session() as session:
+                    for job, fut, stats in batch:
+                        if fut.done():  # caller gave up
+                            continue
+                        try:
+                            with tracing.bind(stats):
+                                async with session.begin_nested():
+                                    result = await job(session)
+                                    if not _succeeded(result):
+                                        raise _RollbackJob
+                        except _RollbackJob:
+                            done.append((fut, result))
+                        except Exception as exc:
+                            fut.set_exception(exc)
+                        else:
+                            done.append((fut, result))
+                    await session.commit()
+            except Exception as exc:
+                for fut, _ in done:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            for fut, result in done:
+                if not fut.done():
+                    fut.set_result(result)
+
+
+_queue: Optional[WriteQueue] = None
+
+
+def _noting_client(job: WriteJob, client: str) -> WriteJob:
+    async def _job(session: AsyncSession) -> Dict[str, Any]:
+        result = await job(session)
+        if _succeeded(result):
+            record_change(session, "client.wrote", client_id=client)
+        return result
+    return _job
+
+
+async def run_write(job: WriteJob) -> Dict[str, Any]:
+    """Run a write job and commit it, through the group-commit queue when enabled."""
+    global _queue
+    client = current_client()
+    if CHANGE_FEED_ENABLED and client is not None and has_read_replica():
+        # Other server processes route this client's reads to the primary too.
+        job = _noting_client(job, client)
+    if write_queue_enabled():
+        if _queue is None:
+            _queue = WriteQueue()
+        result = await _queue.submit(job)
+    else:
+        async with get_async_write_session() as session:
+            result = await job(session)
+            if _succeeded(result):
+                await session.commit()
+    if _succeeded(result):
+        note_write()
+    return result
+
+
+async def close_write_queue() -> None:
+    """Stop the writer task (called on server shutdown)."""
+    if _queue is not None:
+        await _queue.close()
@@ -0,0 +1,10 @@
+from .order_events import OrderEvents, order_events
+from .change_feed import ChangeFeed, change_feed
+
+
+__all__ = [
+    "ChangeFeed",
+    "change_feed",
+    "OrderEvents",
+    "order_events",
+]
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import func, or_
+from sqlmodel import select
+
+from pizzagpt_mcp.cache import menu_catalog
+from pizzagpt_mcp.db import read_routing
+from pizzagpt_mcp.db.database import get_async_session
+from pizzagpt_mcp.db.models import ChangeEvent
+from .order_events import OrderEvents, order_events
+
+logger = logging.getLogger("pizzagpt_mcp.events")
+
+# Delay between polls of change_events while nothing new arrives; bounds how
+# late another process's change reaches this one.
+CHANGE_FEED_POLL_SECONDS = float(os.getenv("CHANGE_FEED_POLL_SECONDS", "0.2"))
+_BATCH = 1000
+# An id skipped by a poll may belong to a transaction that commits later
+# (Postgres hands out ids before commit); it is looked for again this long.
+_GAP_SECONDS = 5.0
+_MAX_GAP = 100
+
+
+class ChangeFeed:
+    """Replays change_events (see db/change_log.py) into this process.
+
+    Order events go to the in-process OrderEvents (SSE, orders.wait_for_update),
+    menu.changed invalidates the menu snapshots, and the writing client is
+    marked for read-your-writes routing. With the feed running, a process also
+    receives its own events this way, so tools do not publish them directly.
+    """
+
+    def __init__(self, events: OrderEvents, poll_seconds: float = CHANGE_FEED_POLL_SECONDS):
+        self.events = events
+        self.poll_seconds = poll_seconds
+        self._last_id: Optional[int] = None
+        # Skipped ids -> monotonic deadline until which they are looked for.
+        self._gaps: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start polling from the newest event; older events are not replayed."""
+        if self._task is not None:
+            return
+        async with get_async_session() as session:
+            self._last_id = (await session.exec(select(func.max(ChangeEvent.id)))).one() or 0
+        self._task = asyncio.create_task(self._run(), name="pizzagpt-change-feed")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.poll() == _BATCH:
+                    continue
+            except Exception:
+                logger.exception("change feed poll failed")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def poll(self) -> int:
+        """Dispatch the events committed since the last poll; returns how many."""
+        now = time.monotonic()
+        self._gaps = {i: deadline for i, deadline in self._gaps.items() if deadline > now}
+        last_id = self._last_id or 0
+        newer = ChangeEvent.id > last_id
+        async with get_async_session() as session:
+            rows = (await session.exec(
+                select(ChangeEvent)
+                .where(or_(newer, ChangeEvent.id.in_(self._gaps)) if self._gaps else newer)
+                .order_by(ChangeEvent.id)
+                .limit(_BATCH)
+            )).all()
+        for row in rows:
+            if row.id > last_id:
+                for missing in range(last_id + 1, min(row.id, last_id + 1 + _MAX_GAP)):
+                    self._gaps[missing] = now + _GAP_SECONDS
+                last_id = row.id
+            else:
+                self._gaps.pop(row.id, None)
+            self._dispatch(row)
+        self._last_id = last_id
+        return len(rows)
+
+    def _dispatch(self, row: ChangeEvent) -> None:
+        if row.kind == "menu.changed":
+            menu_catalog.invalidate()
+        elif row.payload is not None:
+            self.events.publish(row.kind, row.payload)
+        if row.client_id is not None:
+            read_routing.note_client_write(row.client_id)
+
+
+change_feed = ChangeFeed(order_events)
@@ -0,0 +1,50 @@
+import asyncio
+import itertools
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set
+
+
+class OrderEvents:
+    """In-process pub/sub for order changes.
+
+    Tools publish after their write has committed; subscribers (the SSE route,
+    orders.wait_for_update) get events on a bounded queue, either for one
+    order or for all orders (order_id=None). A subscriber that falls behind
+    loses its oldest events rather than holding memory or blocking writers.
+    Waiting costs no database work. With several server processes, events
+    reach this process through the change feed (events/change_feed.py).
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: Dict[Optional[str], Set[asyncio.Queue]] = defaultdict(set)
+        self._seq = itertools.count(1)
+
+    def publish(self, kind: str, order: Dict[str, Any]) -> Dict[str, Any]:
+        event = {"id": next(self._seq), "type": kind, "order": order}
+        for key in (order["id"], None):
+            for queue in self._subscribers.get(key, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(event)
+        return event
+
+    @contextmanager
+    def subscribe(self, order_id: Optional[str] = None) -> Iterator["asyncio.Queue[Dict[str, Any]]"]:
+        queue: asyncio.Queue = asyncio.Queue(self.max_queue)
+        self._subscribers[order_id].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(order_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[order_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(s) for s in self._subscribers.values())
+
+
+order_events = OrderEvents()
@@ -0,0 +1,66 @@
+"""
+Production launcher: N uvicorn worker processes behind one port.
+
+Seeding/restore (same --mode/--dump/... options as main.py) and schema
+creation run once in this process; the workers then start with
+PIZZAGPT_DB_READY=1 and only open their own connection pools.
+
+    python -m pizzagpt_mcp.launcher --workers 4 --mode auto
+
+Notes:
+  - With SQLite, run with SQLITE_PROFILE=production (WAL + busy_timeout) so
+    workers in different processes can write concurrently; Postgres is the
+    better fit for many workers.
+  - With more than one worker, order and menu changes are also written to
+    change_events and every worker polls it (PIZZAGPT_CHANGE_FEED=1), so
+    order events (/orders/events, orders.wait_for_update), menu snapshots and
+    read-your-writes routing follow writes made by any worker, within
+    CHANGE_FEED_POLL_SECONDS. /metrics stays per worker process.
+"""
+import argparse
+import os
+
+import uvicorn
+
+from pizzagpt_mcp.db import database
+from pizzagpt_mcp.db.seed_data import run_seed_or_restore
+
+_parser = argparse.ArgumentParser(description="Run the PizzaGPT MCP server with multiple worker processes.")
+_parser.add_argument(
+    "--workers",
+    type=int,
+    default=int(os.getenv("MCP_WORKERS", str(os.cpu_count() or 1))),
+    help="Number of worker processes (default: MCP_WORKERS or the CPU count)",
+)
+_parser.add_argument("--host", default=os.getenv("MCP_HOST", "0.0.0.0"))
+_parser.add_argument("--port", type=int, default=int(os.getenv("MCP_PORT", "8000")))
+_parser.add_argument("--log-level", default=os.getenv("MCP_LOG_LEVEL", "info"))
+
+
+def main(argv: list[str] | None = None) -> None:
+    args, seed_argv = _parser.parse_known_args(argv)
+
+    print("Starting DB seed/restore...")
+    if run_seed_or_restore(seed_argv) == "archive":
+        # A maintenance run: archive and exit without serving.
+        return
+    database.ensure_db()
+    # Nothing opened here may leak into the workers.
+    database.get_engine().dispose()
+    os.environ["PIZZAGPT_DB_READY"] = "1"
+    if args.workers > 1:
+        os.environ["PIZZAGPT_CHANGE_FEED"] = "1"
+    print("Done.")
+
+    print(f"Starting MCP-Server with {args.workers} workers...")
+    uvicorn.run(
+        "pizzagpt_mcp.asgi:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
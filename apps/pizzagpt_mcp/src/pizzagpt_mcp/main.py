@@ -1,24 +1,38 @@
 import asyncio
+import os
 
-from pizzagpt_mcp.db.seed_data import run_seed_or_restore
+from pizzagpt_mcp.db.database import dispose_async_engines, ensure_db
+from pizzagpt_mcp.db.seed_data import run_seed_or_restore_async
+from pizzagpt_mcp.db.write_queue import close_write_queue
 from pizzagpt_mcp.server import mcp
+from pizzagpt_mcp.api import tool_manifest
 
 
 async def main():
     print("Starting DB seed/restore...")
     # Trigger seeding/restore explicitly. Pass None to parse real CLI args,
     # or provide a list like ["--mode", "seed"] to force behavior.
-    run_seed_or_restore(None)
+    if await run_seed_or_restore_async(None) == "archive":
+        # A maintenance run: archive and exit without serving.
+        await close_write_queue()
+        await dispose_async_engines()
+        return
+    # Schema setup happens once here; tools only check the readiness flag.
+    ensure_db()
+    # Encode the /tools manifest before the first health check asks for it.
+    await tool_manifest()
     print("Done.")
 
     print("Starting MCP-Server...")
 
     await mcp.run_async(
         transport="streamable-http",
-        host="0.0.0.0",
-        port=8000,
-        log_level="debug"
+        host=os.getenv("MCP_HOST", "0.0.0.0"),
+        port=int(os.getenv("MCP_PORT", "8000")),
+        log_level=os.getenv("MCP_LOG_LEVEL", "debug"),
     )
+    await close_write_queue()
+    await dispose_async_engines()
 
     print("Done.")
 
@@ -0,0 +1,11 @@
+from .metrics import MetricsMiddleware, registry
+from .read_routing import ReadRoutingMiddleware
+from .tracing import QueryTracingMiddleware
+
+
+__all__ = [
+    "MetricsMiddleware",
+    "QueryTracingMiddleware",
+    "ReadRoutingMiddleware",
+    "registry",
+]
@@ -0,0 +1,187 @@
+import bisect
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+# Latency buckets in seconds, tuned for tool calls from sub-millisecond cache hits to slow writes.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Labels, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self.values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self.values[_labels(**labels)] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_fmt_labels(k)} {v}" for k, v in self.values.items()]
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self.values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self.values[_labels(**labels)] += amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.values[_labels(**labels)] -= amount
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[_labels(**labels)] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        lines += [f"{self.name}{_fmt_labels(k)} {v}" for k, v in self.values.items()]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name, self.help, self.buckets = name, help, buckets
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self.counts: Dict[Labels, List[int]] = {}
+        self.sums: Dict[Labels, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _labels(**labels)
+        counts = self.counts.get(key)
+        if counts is None:
+            counts = self.counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sums[key] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, [('le', str(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(key)} {self.sums[key]}")
+            lines.append(f"{self.name}_count{_fmt_labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Minimal in-process metric registry rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics: List[Any] = []
+        # Callbacks that refresh point-in-time gauges (e.g. pool stats) right before a scrape.
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        for collect in self.collectors:
+            collect()
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+tool_calls = registry.register(Counter("pizzagpt_tool_calls_total", "MCP tool calls by tool."))
+tool_errors = registry.register(Counter(
+    "pizzagpt_tool_errors_total", "Failed MCP tool calls by tool; kind is exception or not_ok (ok: False result).",
+))
+tool_duration = registry.register(Histogram("pizzagpt_tool_duration_seconds", "MCP tool call latency by tool."))
+tool_in_flight = registry.register(Gauge("pizzagpt_tool_calls_in_flight", "MCP tool calls currently running by tool."))
+requests_in_flight = registry.register(Gauge("pizzagpt_mcp_requests_in_flight", "MCP requests currently being handled."))
+db_pool = registry.register(Gauge(
+    "pizzagpt_db_pool_connections", "Database pool connections by engine and state (checked_out, checked_in, overflow, size).",
+))
+
+
+def _collect_pool_stats() -> None:
+    from pizzagpt_mcp.db.database import get_async_engine, get_async_read_engine, get_engine, has_read_replica
+
+    pools = [("sync", get_engine().pool), ("async", get_async_engine().pool)]
+    if has_read_replica():
+        pools.append(("async_read", get_async_read_engine().pool))
+    for name, pool in pools:
+        # NullPool/StaticPool do not track these; only report what the pool provides.
+        for state, attr in (("checked_out", "checkedout"), ("checked_in", "checkedin"),
+                            ("overflow", "overflow"), ("size", "size")):
+            fn = getattr(pool, attr, None)
+            if fn is not None:
+                db_pool.set(fn(), engine=name, state=state)
+
+
+registry.collectors.append(_collect_pool_stats)
+
+tool_db_queries = registry.register(Counter("pizzagpt_tool_db_queries_total", "SQL statements issued by tool."))
+tool_db_seconds = registry.register(Counter("pizzagpt_tool_db_seconds_total", "Time spent in SQL statements by tool."))
+
+
+def _collect_query_stats() -> None:
+    from pizzagpt_mcp.db.tracing import tool_totals
+
+    for tool, (queries, seconds) in list(tool_totals.items()):
+        tool_db_queries.values[_labels(tool=tool)] = queries
+        tool_db_seconds.values[_labels(tool=tool)] = seconds
+
+
+registry.collectors.append(_collect_query_stats)
+
+
+def _is_not_ok(result: Any) -> bool:
+    structured = getattr(result, "structured_content", None)
+    return isinstance(structured, dict) and structured.get("ok") is False
+
+
+class MetricsMiddleware(Middleware):
+    """Counts, times and tracks in-flight MCP requests and tool calls for /metrics."""
+
+    async def on_request(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        requests_in_flight.inc()
+        try:
+            return await call_next(context)
+        finally:
+            requests_in_flight.dec()
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        tool = context.message.name
+        tool_calls.inc(tool=tool)
+        tool_in_flight.inc(tool=tool)
+        start = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            tool_errors.inc(tool=tool, kind="exception")
+            raise
+        finally:
+            tool_duration.observe(time.perf_counter() - start, tool=tool)
+            tool_in_flight.dec(tool=tool)
+        if _is_not_ok(result):
+            tool_errors.inc(tool=tool, kind="not_ok")
+        return result
@@ -0,0 +1,39 @@
+import os
+from typing import Any, Optional
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from pizzagpt_mcp.db import read_routing
+
+# Request header naming the calling client. Stateless HTTP has no MCP session
+# that survives between requests, so clients send this on every request to
+# keep reading their own writes; it takes precedence over the session id.
+CLIENT_ID_HEADER = os.getenv("CLIENT_ID_HEADER", "x-client-id").lower()
+
+
+def _client_id(context: MiddlewareContext) -> Optional[str]:
+    client = get_http_headers().get(CLIENT_ID_HEADER)
+    if client:
+        # Prefixed so a header value can never collide with an MCP session id.
+        return f"header:{client[:200]}"
+    ctx = context.fastmcp_context
+    if ctx is None:
+        return None
+    try:
+        return ctx.session_id
+    except RuntimeError:  # no MCP session (e.g. called outside a request)
+        return None
+
+
+class ReadRoutingMiddleware(Middleware):
+    """Sends a tool call's replica reads to the primary when its client wrote recently.
+
+    The client is the CLIENT_ID_HEADER value, else the MCP session id. Without
+    either (stateless HTTP and no header) read-your-writes only holds within
+    one tool call, except that orders.get confirms a replica miss on the primary.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        with read_routing.route_call(_client_id(context)):
+            return await call_next(context)
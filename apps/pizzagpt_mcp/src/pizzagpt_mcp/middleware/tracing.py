@@ -0,0 +1,20 @@
+import logging
+from typing import Any
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from pizzagpt_mcp.db import tracing
+
+logger = logging.getLogger("pizzagpt_mcp.sql")
+
+
+class QueryTracingMiddleware(Middleware):
+    """Attributes SQL query counts and DB time to the MCP tool call that issued them."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        with tracing.trace_tool(context.message.name) as stats:
+            try:
+                return await call_next(context)
+            finally:
+                # Failing calls are traced too; they are often the slow ones.
+                logger.debug("tool %s: %d queries, %.2f ms in DB", stats.tool, stats.queries, stats.db_seconds * 1000)
@@ -0,0 +1,46 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+
+# Shorter names used by compact mode; keys not listed are kept as they are.
+COMPACT_KEYS = {
+    "description": "desc",
+    "price_cents": "price",
+    "is_active": "active",
+    "loyalty_points": "points",
+    "customer_id": "customer",
+    "subtotal_cents": "subtotal",
+    "discount_cents": "discount",
+    "tax_cents": "tax",
+    "total_cents": "total",
+    "menu_item_id": "item",
+    "unit_price_cents": "unit_price",
+    "line_total_cents": "line_total",
+    "special_requests": "requests",
+}
+
+
+def dumps(data: Any) -> str:
+    """Serialize tool results to compact JSON with orjson (FastMCP's tool_serializer)."""
+    if isinstance(data, str):
+        return data
+    return orjson.dumps(data, default=str).decode()
+
+
+def fields_error(fields: Optional[List[str]], allowed: Iterable[str]) -> Optional[str]:
+    """Return an error message if ``fields`` names anything outside ``allowed``."""
+    if not fields:
+        return None
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        return f"unknown fields: {', '.join(unknown)}; available: {', '.join(allowed)}"
+    return None
+
+
+def shape(record: Dict[str, Any], fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    """Apply a field projection and/or compact mode (short keys, no null values) to one record."""
+    if fields:
+        record = {k: record[k] for k in fields if k in record}
+    if compact:
+        record = {COMPACT_KEYS.get(k, k): v for k, v in record.items() if v is not None}
+    return record
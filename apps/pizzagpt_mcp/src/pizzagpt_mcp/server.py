@@ -1,12 +1,32 @@
 from fastmcp import FastMCP
+from fastmcp.tools import Tool
+
+from pizzagpt_mcp.middleware import MetricsMiddleware, QueryTracingMiddleware, ReadRoutingMiddleware
+from pizzagpt_mcp.serialization import dumps
 # from mcp.types import Icon
 
 
-mcp = FastMCP(
+class PizzaGPTMCP(FastMCP):
+    """FastMCP that counts changes to its tool registry, so derived data
+    such as the /tools manifest is rebuilt only when tools are added or removed."""
+
+    tools_generation = 0
+
+    def add_tool(self, tool: Tool) -> Tool:
+        self.tools_generation += 1
+        return super().add_tool(tool)
+
+    def remove_tool(self, name: str) -> None:
+        self.tools_generation += 1
+        super().remove_tool(name)
+
+
+mcp = PizzaGPTMCP(
     name="PizzaGPT MCP Server",
     instructions="MCP tools for menu, orders, and customers for an AI pizza restaurant.",
     host="0.0.0.0",
     port=8000,
+    tool_serializer=dumps,
     # icons=[
     #     Icon(
     #         src="",
@@ -15,6 +35,9 @@ mcp = FastMCP(
     #     ),
     # ],
 )
+mcp.add_middleware(MetricsMiddleware())
+mcp.add_middleware(QueryTracingMiddleware())
+mcp.add_middleware(ReadRoutingMiddleware())
 
 
 from pizzagpt_mcp.tools import * # type: ignore
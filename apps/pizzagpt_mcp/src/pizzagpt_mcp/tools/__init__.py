@@ -1,10 +1,12 @@
 from .customers import *
 from .menu import *
 from .orders import *
+from .reports import *
 
 
 __all__ = [
     "customers",
     "menu",
     "orders",
+    "reports",
 ]
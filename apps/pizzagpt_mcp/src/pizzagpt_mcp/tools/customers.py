@@ -1,10 +1,26 @@
-from typing import Any, Dict, Optional
-from sqlmodel import Session, select
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from pizzagpt_mcp.db.database import get_engine, init_db
+from pizzagpt_mcp.db.database import ensure_db
 from pizzagpt_mcp.db.models import Customer
+from pizzagpt_mcp.db.models.customer import normalize_email, normalize_phone
+from pizzagpt_mcp.db.pagination import decode_cursor, encode_cursor
+from pizzagpt_mcp.db.read_routing import get_async_read_session
+from pizzagpt_mcp.db.write_queue import run_write
+from pizzagpt_mcp.serialization import fields_error, shape
 from pizzagpt_mcp.server import mcp
 
+CUSTOMER_FIELDS = ("id", "name", "email", "phone", "loyalty_points")
+
+# Largest page customers.list returns; bigger limits are clamped to it.
+MAX_LIST_LIMIT = 1000
+
 
 def _to_dict(c: Customer) -> Dict[str, Any]:
     return {
@@ -16,74 +32,168 @@ def _to_dict(c: Customer) -> Dict[str, Any]:
     }
 
 
+def _upsert(dialect: str, values: Dict[str, Any], key: str):
+    """INSERT … ON CONFLICT (key) … RETURNING the inserted or the existing customer in one statement."""
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert(Customer).values(**values)
+    # A no-op update (rather than DO NOTHING) makes RETURNING yield the existing row too.
+    stmt = stmt.on_conflict_do_update(index_elements=[key], set_={key: getattr(stmt.excluded, key)})
+    return stmt.returning(Customer).execution_options(populate_existing=True)
+
+
 @mcp.tool(
     name="customers.find_or_create",
-    description="Find an existing customer by email/phone/name or create one.",
+    description=(
+        "Find an existing customer by email/phone/name or create one. An unknown email together with a phone "
+        "number that belongs to another customer returns ok=false with conflict='phone' and that customer."
+    ),
 )
-def find_or_create(
+async def find_or_create(
         name: Optional[str] = None,
         email: Optional[str] = None,
         phone: Optional[str] = None,
 ) -> Dict[str, Any]:
-    init_db()
+    ensure_db()
     if not (name or email or phone):
         return {"ok": False, "error": "Provide at least one of name/email/phone"}
-    with Session(get_engine()) as session:
-        stmt = select(Customer)
-        if email:
-            stmt = stmt.where(Customer.email == email)
-        elif phone:
-            stmt = stmt.where(Customer.phone == phone)
-        elif name:
-            stmt = stmt.where(Customer.name == name)
-        existing = session.exec(stmt.limit(1)).first()
-        if existing:
-            return {"ok": True, "customer": _to_dict(existing), "created": False}
-        cust = Customer(name=name or (email or phone or "Guest"), email=email, phone=phone)
-        session.add(cust)
-        session.commit()
-        session.refresh(cust)
-        return {"ok": True, "customer": _to_dict(cust), "created": True}
+    email_key, phone_key = normalize_email(email), normalize_phone(phone)
+
+    async def _write(session: AsyncSession) -> Dict[str, Any]:
+        if not (email_key or phone_key):
+            # Names are not unique, so there is nothing to upsert on.
+            existing = (await session.exec(select(Customer).where(Customer.name == name).limit(1))).first()
+            if existing:
+                return {"ok": True, "customer": _to_dict(existing), "created": False}
+            cust = Customer(name=name or (email or phone or "Guest"), email=email, phone=phone)
+            session.add(cust)
+            await session.flush()
+            return {"ok": True, "customer": _to_dict(cust), "created": True}
+
+        now = datetime.utcnow()
+        new_id = uuid.uuid4()
+        values = {
+            "id": new_id,
+            "name": name or (email or phone),
+            "email": email,
+            "phone": phone,
+            "email_normalized": email_key,
+            "phone_e164": phone_key,
+            "loyalty_points": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        key = "email_normalized" if email_key else "phone_e164"
+        stmt = _upsert(session.bind.dialect.name, values, key)
+        if email_key and phone_key:
+            # The phone number may already belong to a customer with another email.
+            try:
+                async with session.begin_nested():
+                    cust = (await session.exec(stmt)).scalar_one()
+            except IntegrityError:
+                owner = (await session.exec(select(Customer).where(Customer.phone_e164 == phone_key))).one()
+                return {
+                    "ok": False,
+                    "error": "phone already belongs to another customer",
+                    "conflict": "phone",
+                    "customer": _to_dict(owner),
+                }
+        else:
+            cust = (await session.exec(stmt)).scalar_one()
+        return {"ok": True, "customer": _to_dict(cust), "created": cust.id == new_id}
+
+    return await run_write(_write)
 
 
 @mcp.tool(
     name="customers.get",
-    description="Get a customer by id (UUID).",
+    description="Get a customer by id (UUID). fields limits the keys returned; compact=true uses short keys.",
 )
-def get_customer(id: str) -> Dict[str, Any]:
-    init_db()
-    with Session(get_engine()) as session:
-        c = session.get(Customer, id)
+async def get_customer(id: str, fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    ensure_db()
+    error = fields_error(fields, CUSTOMER_FIELDS)
+    if error:
+        return {"ok": False, "error": error}
+    try:
+        customer_id = uuid.UUID(str(id))
+    except ValueError:
+        return {"ok": False, "error": f"invalid id: {id}"}
+    async with get_async_read_session() as session:
+        c = await session.get(Customer, customer_id)
         if not c:
             return {"ok": False, "error": "customer not found"}
-        return {"ok": True, "customer": _to_dict(c)}
+        return {"ok": True, "customer": shape(_to_dict(c), fields, compact)}
 
 
 @mcp.tool(
     name="customers.list",
-    description="List customers from the database with optional pagination.",
+    description=(
+        "List customers ordered by id with optional pagination. "
+        "Pass next_cursor from a previous response as cursor to fetch the next page. "
+        "fields limits the keys per customer; compact=true uses short keys and omits nulls."
+    ),
 )
-def list_customers(
+async def list_customers(
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
 ) -> Dict[str, Any]:
     """
     List customers from the database.
 
     Args:
-        limit: Maximum number of customers to return (default 100).
+        limit: Maximum number of customers to return (default 100, at most MAX_LIST_LIMIT).
         offset: Number of customers to skip before starting to collect the result set.
+            Ignored when a cursor is given; prefer cursors for deep pages.
+        cursor: Opaque cursor from a previous call's next_cursor.
+        fields: Only return these customer keys (see CUSTOMER_FIELDS).
+        compact: Use short keys and drop null values.
 
     Returns:
         A dict with:
           - ok: bool
           - customers: list of customer dicts (see _to_dict)
+          - next_cursor: cursor for the next page, or None on the last page
     """
-    init_db()
-    with Session(get_engine()) as session:
-        stmt = select(Customer).offset(offset).limit(limit)
-        customers = session.exec(stmt).all()
+    ensure_db()
+    error = fields_error(fields, CUSTOMER_FIELDS)
+    if error:
+        return {"ok": False, "error": error}
+    limit = int(limit)
+    if limit < 1:
+        return {"ok": False, "error": "limit must be >= 1"}
+    limit = min(limit, MAX_LIST_LIMIT)
+    offset = int(offset)
+    if offset < 0:
+        return {"ok": False, "error": "offset must be >= 0"}
+    stmt = select(Customer).order_by(Customer.id)
+    if cursor:
+        try:
+            (last_id,) = decode_cursor(cursor, str)
+            stmt = stmt.where(Customer.id > uuid.UUID(last_id))
+        except (ValueError, TypeError, AttributeError):
+            return {"ok": False, "error": f"invalid cursor: {cursor}"}
+    elif offset:
+        stmt = stmt.offset(offset)
+    async with get_async_read_session() as session:
+        customers = (await session.exec(stmt.limit(limit + 1))).all()
+        next_cursor = None
+        if len(customers) > limit:
+            customers = customers[:limit]
+            next_cursor = encode_cursor(customers[-1].id)
         return {
             "ok": True,
-            "customers": [_to_dict(c) for c in customers],
+            "customers": [shape(_to_dict(c), fields, compact) for c in customers],
+            "next_cursor": next_cursor,
         }
+
+
+async def iter_customers(chunk_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+    """Stream every customer (ordered by id) without materializing the whole table."""
+    ensure_db()
+    async with get_async_read_session() as session:
+        stmt = select(Customer).order_by(Customer.id).execution_options(yield_per=chunk_size)
+        result = await session.stream_scalars(stmt)
+        async for c in result:
+            yield _to_dict(c)
@@ -1,10 +1,21 @@
-from typing import Any, Dict, Optional
-from sqlmodel import Session, select
+import hashlib
+import json
+import uuid
+from typing import Any, Dict, List, Optional
 
-from pizzagpt_mcp.db.database import get_engine, init_db
+from pizzagpt_mcp.cache import MenuCatalog, MenuSnapshot
+from pizzagpt_mcp.db.database import ensure_db
+from pizzagpt_mcp.db.search import correct_terms, search_menu_ids
 from pizzagpt_mcp.db.models import MenuItem
+from pizzagpt_mcp.db.read_routing import get_async_read_session
+from pizzagpt_mcp.serialization import fields_error, shape
 from pizzagpt_mcp.server import mcp
 
+MENU_FIELDS = ("id", "name", "description", "size", "price_cents", "is_active")
+
+# Most matches menu.search returns; bigger limits are clamped to it.
+MAX_SEARCH_LIMIT = 100
+
 
 def _to_dict(mi: MenuItem) -> Dict[str, Any]:
     return {
@@ -17,30 +28,107 @@ def _to_dict(mi: MenuItem) -> Dict[str, Any]:
     }
 
 
+_catalog = MenuCatalog(_to_dict)
+
+
+def _list_version(
+        snap: MenuSnapshot,
+        name: Optional[str],
+        only_active: bool,
+        fields: Optional[List[str]],
+        compact: bool,
+) -> str:
+    """Version of one menu.list_items response: the menu version plus the arguments that shape it."""
+    args = [snap.version, name.lower() if name else None, bool(only_active), fields or None, bool(compact)]
+    return hashlib.sha1(json.dumps(args).encode()).hexdigest()[:16]
+
+
+async def menu_snapshot() -> MenuSnapshot:
+    """Current menu snapshot, for tools that need menu names or prices without a query."""
+    return await _catalog.snapshot()
+
+
 @mcp.tool(
     name="menu.list_items",
-    description="List menu items with optional filters: name (substring), only_active (default true).",
+    description=(
+        "List menu items with optional filters: name (substring), only_active (default true). "
+        "Pass the returned version as if_version, with the same filters, to get not_modified instead of "
+        "the items when unchanged. "
+        "fields limits each item to the given keys; compact=true uses short keys and omits nulls."
+    ),
 )
-def list_items(name: Optional[str] = None, only_active: bool = True) -> Dict[str, Any]:
-    init_db()
-    with Session(get_engine()) as session:
-        stmt = select(MenuItem)
-        if only_active:
-            stmt = stmt.where(MenuItem.is_active == True)  # noqa: E712
-        if name:
-            stmt = stmt.where(MenuItem.name.ilike(f"%{name}%"))
-        items = session.exec(stmt.order_by(MenuItem.name, MenuItem.size)).all()
-        return {"ok": True, "items": [_to_dict(i) for i in items]}
+async def list_items(
+        name: Optional[str] = None,
+        only_active: bool = True,
+        if_version: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        compact: bool = False,
+) -> Dict[str, Any]:
+    ensure_db()
+    error = fields_error(fields, MENU_FIELDS)
+    if error:
+        return {"ok": False, "error": error}
+    snap = await _catalog.snapshot()
+    # A version from a differently filtered call never matches, so a client
+    # cannot get not_modified for items it has not received.
+    version = _list_version(snap, name, only_active, fields, compact)
+    if if_version and if_version == version:
+        return {"ok": True, "version": version, "not_modified": True}
+    items = snap.list(name, only_active)
+    if fields or compact:
+        items = [shape(item, fields, compact) for item in items]
+    return {"ok": True, "version": version, "items": items}
 
 
 @mcp.tool(
     name="menu.get_item",
-    description="Get a single menu item by id (UUID).",
+    description="Get a single menu item by id (UUID). Supports fields and compact like menu.list_items.",
+)
+async def get_item(id: str, fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    ensure_db()
+    error = fields_error(fields, MENU_FIELDS)
+    if error:
+        return {"ok": False, "error": error}
+    try:
+        item_id = uuid.UUID(str(id))
+    except ValueError:
+        return {"ok": False, "error": f"invalid id: {id}"}
+    snap = await _catalog.snapshot()
+    item = snap.by_id.get(item_id)
+    if not item:
+        return {"ok": False, "error": "menu item not found"}
+    return {"ok": True, "version": snap.version, "item": shape(item, fields, compact)}
+
+
+@mcp.tool(
+    name="menu.search",
+    description=(
+        "Ranked, typo-tolerant search over menu item name, description and size, "
+        "e.g. 'pepperoni', 'mushrooms', 'margarita 16in'. Returns the best matches first (limit, max 100). "
+        "Supports fields and compact like menu.list_items."
+    ),
 )
-def get_item(id: str) -> Dict[str, Any]:
-    init_db()
-    with Session(get_engine()) as session:
-        mi = session.get(MenuItem, id)
-        if not mi:
-            return {"ok": False, "error": "menu item not found"}
-        return {"ok": True, "item": _to_dict(mi)}
+async def search(
+        query: str,
+        limit: int = 10,
+        only_active: bool = True,
+        fields: Optional[List[str]] = None,
+        compact: bool = False,
+) -> Dict[str, Any]:
+    ensure_db()
+    error = fields_error(fields, (*MENU_FIELDS, "score"))
+    if error:
+        return {"ok": False, "error": error}
+    limit = int(limit)
+    if limit < 1:
+        return {"ok": False, "error": "limit must be >= 1"}
+    limit = min(limit, MAX_SEARCH_LIMIT)
+    snap = await _catalog.snapshot()
+    terms = correct_terms(query, snap.vocabulary)
+    async with get_async_read_session() as session:
+        hits = await search_menu_ids(session, terms, limit, only_active)
+    items = [
+        shape({**snap.by_id[mid], "score": round(score, 4)}, fields, compact)
+        for mid, score in hits if mid in snap.by_id
+    ]
+    return {"ok": True, "version": snap.version, "terms": terms, "items": items}
@@ -1,10 +1,25 @@
+import asyncio
 import uuid
-from typing import Any, Dict, List, Optional
-from sqlmodel import Session, select
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+from sqlalchemy import and_, insert, or_, update
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from pizzagpt_mcp.db.database import get_engine, init_db
-from pizzagpt_mcp.db.models import Customer, MenuItem, Order, OrderItem, OrderStatus
+from pizzagpt_mcp.cache import MenuSnapshot
+from pizzagpt_mcp.db.archive import TERMINAL_STATUSES, archive_orders
+from pizzagpt_mcp.db.change_log import CHANGE_FEED_ENABLED, record_change
+from pizzagpt_mcp.db.database import ensure_db, get_async_session
+from pizzagpt_mcp.db.idempotency import run_idempotent
+from pizzagpt_mcp.db.models import ArchivedOrder, Customer, MenuItem, Order, OrderItem, OrderStatus
+from pizzagpt_mcp.db.pagination import decode_cursor, encode_cursor
+from pizzagpt_mcp.db.read_routing import get_async_read_session, reads_from_primary
+from pizzagpt_mcp.db.rollups import apply_status_change
+from pizzagpt_mcp.events import order_events
+from pizzagpt_mcp.serialization import fields_error, shape
 from pizzagpt_mcp.server import mcp
+from pizzagpt_mcp.tools import menu as menu_tools
 
 
 def _order_item_dict(oi: OrderItem) -> Dict[str, Any]:
@@ -12,13 +27,14 @@ def _order_item_dict(oi: OrderItem) -> Dict[str, Any]:
         "id": str(oi.id),
         "menu_item_id": str(oi.menu_item_id),
         "quantity": oi.quantity,
+        "unit_price_cents": oi.unit_price_cents,
         "special_requests": oi.special_requests,
         "line_total_cents": oi.line_total_cents,
     }
 
 
-def _order_dict(o: Order) -> Dict[str, Any]:
-    return {
+def _order_dict(o: Order, items: bool = True) -> Dict[str, Any]:
+    d = {
         "id": str(o.id),
         "customer_id": str(o.customer_id),
         "subtotal_cents": o.subtotal_cents,
@@ -27,161 +43,513 @@ def _order_dict(o: Order) -> Dict[str, Any]:
         "total_cents": o.total_cents,
         "status": o.status.value if hasattr(o.status, "value") else str(o.status),
         "notes": o.notes,
-        "items": [_order_item_dict(i) for i in (o.items or [])],
     }
+    if items:
+        d["items"] = [_order_item_dict(i) for i in (o.items or [])]
+    return d
+
+
+# Largest page orders.list returns; bigger limits are clamped to it.
+MAX_LIST_LIMIT = 500
+
+ORDER_FIELDS = (
+    "id", "customer_id", "subtotal_cents", "discount_cents", "tax_cents", "total_cents", "status", "notes", "items",
+)
+
+
+def _wants_items(fields: Optional[List[str]]) -> bool:
+    return not fields or "items" in fields
+
+
+def _item_summary(oi: OrderItem, menu: MenuSnapshot) -> str:
+    mi = menu.by_id.get(oi.menu_item_id)
+    label = f"{mi['name']} {mi['size']}".strip() if mi else str(oi.menu_item_id)
+    summary = f"{oi.quantity}x {label}"
+    return f"{summary} ({oi.special_requests})" if oi.special_requests else summary
+
+
+async def _shape_orders(orders: List[Order], fields: Optional[List[str]], compact: bool) -> List[Dict[str, Any]]:
+    """Serialize orders for a response; compact mode lists items as "2x Pepperoni 14in" summaries."""
+    with_items = _wants_items(fields)
+    if not compact:
+        return [shape(_order_dict(o, with_items), fields) for o in orders]
+    menu = await menu_tools.menu_snapshot() if with_items else None
+    shaped = []
+    for o in orders:
+        d = _order_dict(o, items=False)
+        if with_items:
+            d["items"] = [_item_summary(oi, menu) for oi in o.items]
+        shaped.append(shape(d, fields, compact=True))
+    return shaped
+
+
+def _parse_uuid(value: Any) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+# Keeps IN (...) lists well below the bound-parameter limits of SQLite and Postgres.
+_IN_CHUNK = 500
+
+
+def _chunks(values: List[Any], size: int = _IN_CHUNK) -> Iterable[List[Any]]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
 
 
-def _recalculate_totals(session: Session, order: Order) -> None:
+async def _menu_prices(session: AsyncSession, ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, int]:
+    """Fetch current prices for the given menu item ids with IN (...) queries."""
+    prices: Dict[uuid.UUID, int] = {}
+    for chunk in _chunks(list(set(ids))):
+        rows = await session.exec(select(MenuItem.id, MenuItem.price_cents).where(MenuItem.id.in_(chunk)))
+        prices.update(rows.all())
+    return prices
+
+
+def _parse_items(items: List[Dict[str, Any]]) -> tuple[List[tuple[Dict[str, Any], uuid.UUID, int]], Optional[str]]:
+    """Validate the shape of order lines; returns (row, menu_item_id, quantity) tuples or an error."""
+    if not items:
+        return [], "items list is required"
+    parsed = []
+    for row in items:
+        mid = _parse_uuid(row.get("menu_item_id"))
+        try:
+            qty = int(row.get("quantity", 1))
+        except (TypeError, ValueError):
+            qty = 0
+        if not mid or qty < 1:
+            return [], "each item requires menu_item_id and quantity>=1"
+        parsed.append((row, mid, qty))
+    return parsed, None
+
+
+def _totals(subtotal_cents: int, discount_cents: int) -> tuple[int, int]:
+    """Return (tax_cents, total_cents) for an order subtotal and discount."""
+    taxable = max(0, subtotal_cents - discount_cents)
+    tax_cents = int(round(taxable * 0.08))
+    return tax_cents, subtotal_cents - discount_cents + tax_cents
+
+
+def _recalculate_totals(order: Order) -> None:
+    # Uses the unit price snapshotted on each line, so no menu lookups are needed.
     subtotal = 0
     for it in order.items:
-        mi = session.get(MenuItem, it.menu_item_id)
-        price = mi.price_cents if mi else 0
-        it.line_total_cents = price * it.quantity
+        it.line_total_cents = it.unit_price_cents * it.quantity
         subtotal += it.line_total_cents
     order.subtotal_cents = subtotal
-    taxable = max(0, order.subtotal_cents - order.discount_cents)
-    order.tax_cents = int(round(taxable * 0.08))
-    order.total_cents = order.subtotal_cents - order.discount_cents + order.tax_cents
+    order.tax_cents, order.total_cents = _totals(order.subtotal_cents, order.discount_cents)
+
+
+def _publish(kind: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    # Called after run_write has committed; replays changed nothing and are not re-announced.
+    # With several server processes the change feed delivers the event instead (see _record).
+    if result.get("ok") and not result.get("replayed") and not CHANGE_FEED_ENABLED:
+        order_events.publish(kind, result["order"])
+    return result
+
+
+def _record(session: AsyncSession, kind: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    # Inside the write job: the event commits (or rolls back) with the change.
+    record_change(session, kind, result["order"])
+    return result
+
+
+async def _get_order(session: AsyncSession, order_id: uuid.UUID, for_update: bool = False) -> Optional[Order]:
+    # Items are loaded eagerly: lazy loads are not available on an async session.
+    # Write jobs lock the order row (FOR UPDATE; SQLite write sessions already
+    # hold the database write lock), so concurrent writes to one order see
+    # each other's items and status instead of recomputing from stale data.
+    return await session.get(
+        Order, order_id, options=[selectinload(Order.items)], with_for_update=for_update or None,
+    )
+
+
+async def _not_found(session: AsyncSession, order_id: Optional[uuid.UUID]) -> Dict[str, Any]:
+    # Only reached on a miss, so archived orders cost the hot path nothing.
+    if order_id is not None and await session.get(ArchivedOrder, order_id) is not None:
+        return {"ok": False, "error": "order is archived and can no longer be changed"}
+    return {"ok": False, "error": "order not found"}
 
 
 @mcp.tool(
     name="orders.create",
-    description="Create an order: customer_id, items[{menu_item_id, quantity, special_requests?}], notes?, discount_cents?",
+    description=(
+        "Create an order: customer_id, items[{menu_item_id, quantity, special_requests?}], notes?, discount_cents?, "
+        "idempotency_key? (retries with the same key return the first result instead of a duplicate order)"
+    ),
 )
-def create_order(
+async def create_order(
         customer_id: str,
         items: List[Dict[str, Any]],
         notes: Optional[str] = None,
         discount_cents: int = 0,
+        idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
-    init_db()
-    if not items:
-        return {"ok": False, "error": "items list is required"}
-    with Session(get_engine()) as session:
-        cust = session.get(Customer, customer_id)
+    ensure_db()
+    parsed, error = _parse_items(items)
+    if error:
+        return {"ok": False, "error": error}
+    cid = _parse_uuid(customer_id)
+    if cid is None:
+        return {"ok": False, "error": f"invalid customer_id: {customer_id}"}
+
+    async def _write(session: AsyncSession) -> Dict[str, Any]:
+        cust = await session.get(Customer, cid)
         if not cust:
             return {"ok": False, "error": "customer not found"}
-        order = Order(customer_id=cust.id, status=OrderStatus.PENDING, notes=notes, discount_cents=int(discount_cents))
-        session.add(order)
-        session.flush()
 
+        prices = await _menu_prices(session, (mid for _, mid, _ in parsed))
         order_items: List[OrderItem] = []
-        for row in items:
-            mid = row.get("menu_item_id")
-            qty = int(row.get("quantity", 1))
-            if not mid or qty < 1:
-                return {"ok": False, "error": "each item requires menu_item_id and quantity>=1"}
-            if not session.get(MenuItem, mid):
-                return {"ok": False, "error": f"menu item not found: {mid}"}
-            oi = OrderItem(
-                order_id=order.id,
-                menu_item_id=uuid.UUID(str(mid)),
+        for row, mid, qty in parsed:
+            if mid not in prices:
+                return {"ok": False, "error": f"menu item not found: {row.get('menu_item_id')}"}
+            order_items.append(OrderItem(
+                menu_item_id=mid,
                 quantity=qty,
+                unit_price_cents=prices[mid],
                 special_requests=row.get("special_requests"),
-            )
-            order_items.append(oi)
-            session.add(oi)
+            ))
 
-        session.flush()
-        order.items = order_items
-        _recalculate_totals(session, order)
+        order = Order(
+            customer_id=cust.id,
+            status=OrderStatus.PENDING,
+            notes=notes,
+            discount_cents=int(discount_cents),
+            items=order_items,
+        )
         session.add(order)
-        session.commit()
-        session.refresh(order)
+        _recalculate_totals(order)
+        await session.flush()
         return {"ok": True, "order": _order_dict(order)}
 
+    return await run_idempotent("orders.create", idempotency_key, {
+        "customer_id": customer_id, "items": items, "notes": notes, "discount_cents": discount_cents,
+    }, _write)
+
+
+@mcp.tool(
+    name="orders.create_many",
+    description=(
+        "Bulk-create orders in one transaction: orders[{customer_id, items[{menu_item_id, quantity, "
+        "special_requests?}], notes?, discount_cents?}]. Invalid rows are reported in errors by index "
+        "and do not abort the batch. idempotency_key? makes retries safe."
+    ),
+)
+async def create_many(orders: List[Dict[str, Any]], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    ensure_db()
+    if not orders:
+        return {"ok": False, "error": "orders list is required"}
+
+    invalid: List[Dict[str, Any]] = []
+    candidates = []
+    for index, row in enumerate(orders):
+        cid = _parse_uuid(row.get("customer_id"))
+        parsed, error = _parse_items(row.get("items") or [])
+        if cid is None:
+            error = f"invalid customer_id: {row.get('customer_id')}"
+        try:
+            discount = int(row.get("discount_cents", 0))
+        except (TypeError, ValueError):
+            error = error or f"invalid discount_cents: {row.get('discount_cents')}"
+        if error:
+            invalid.append({"index": index, "error": error})
+            continue
+        candidates.append((index, row, cid, discount, parsed))
+
+    async def _write(session: AsyncSession) -> Dict[str, Any]:
+        # Built per run, so a job that runs again does not report the same row twice.
+        errors = list(invalid)
+        # Set-based validation: one IN (...) pass for customers and one for menu prices.
+        customer_ids = list({cid for _, _, cid, _, _ in candidates})
+        known_customers = set()
+        for chunk in _chunks(customer_ids):
+            known_customers.update((await session.exec(select(Customer.id).where(Customer.id.in_(chunk)))).all())
+        prices = await _menu_prices(session, (mid for *_, parsed in candidates for _, mid, _ in parsed))
+
+        now = datetime.utcnow()
+        order_rows: List[Dict[str, Any]] = []
+        item_rows: List[Dict[str, Any]] = []
+        created: List[Dict[str, Any]] = []
+        for index, row, cid, discount, parsed in candidates:
+            if cid not in known_customers:
+                errors.append({"index": index, "error": "customer not found"})
+                continue
+            missing = next((r.get("menu_item_id") for r, mid, _ in parsed if mid not in prices), None)
+            if missing is not None:
+                errors.append({"index": index, "error": f"menu item not found: {missing}"})
+                continue
+
+            order_id = uuid.uuid4()
+            subtotal = 0
+            for item, mid, qty in parsed:
+                line_total = prices[mid] * qty
+                subtotal += line_total
+                item_rows.append({
+                    "id": uuid.uuid4(),
+                    "order_id": order_id,
+                    "menu_item_id": mid,
+                    "quantity": qty,
+                    "special_requests": item.get("special_requests"),
+                    "unit_price_cents": prices[mid],
+                    "line_total_cents": line_total,
+                })
+            tax, total = _totals(subtotal, discount)
+            order_rows.append({
+                "id": order_id,
+                "customer_id": cid,
+                "subtotal_cents": subtotal,
+                "discount_cents": discount,
+                "tax_cents": tax,
+                "total_cents": total,
+                "status": OrderStatus.PENDING,
+                "notes": row.get("notes"),
+                "created_at": now,
+                "updated_at": now,
+            })
+            created.append({"index": index, "order_id": str(order_id), "total_cents": total})
+
+        if order_rows:
+            await session.exec(insert(Order), params=order_rows)
+            await session.exec(insert(OrderItem), params=item_rows)
+        errors.sort(key=lambda e: e["index"])
+        return {"ok": True, "created": created, "errors": errors}
+
+    return await run_idempotent("orders.create_many", idempotency_key, {"orders": orders}, _write)
+
 
 @mcp.tool(
     name="orders.add_item",
-    description="Add an item to an order: order_id, menu_item_id, quantity>=1, special_requests?",
+    description=(
+        "Add an item to an order: order_id, menu_item_id, quantity>=1, special_requests?, "
+        "idempotency_key? (retries with the same key do not add the line twice)"
+    ),
 )
-def add_item(
+async def add_item(
         order_id: str,
         menu_item_id: str,
         quantity: int = 1,
         special_requests: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
-    init_db()
+    ensure_db()
     if quantity < 1:
         return {"ok": False, "error": "quantity must be >= 1"}
-    with Session(get_engine()) as session:
-        order = session.get(Order, order_id)
+    oid = _parse_uuid(order_id)
+    mid = _parse_uuid(menu_item_id)
+
+    async def _write(session: AsyncSession) -> Dict[str, Any]:
+        order = await _get_order(session, oid, for_update=True) if oid else None
         if not order:
-            return {"ok": False, "error": "order not found"}
-        if session.get(MenuItem, menu_item_id) is None:
+            return await _not_found(session, oid)
+        if order.status in TERMINAL_STATUSES:
+            # Completed orders are already counted in the sales rollups.
+            return {"ok": False, "error": f"cannot add items to a {order.status.value} order"}
+        mi = await session.get(MenuItem, mid) if mid else None
+        if mi is None:
             return {"ok": False, "error": "menu item not found"}
         oi = OrderItem(
             order_id=order.id,
-            menu_item_id=uuid.UUID(str(menu_item_id)),
+            menu_item_id=mid,
             quantity=int(quantity),
+            unit_price_cents=mi.price_cents,
             special_requests=special_requests,
         )
-        session.add(oi)
-        session.flush()
-        session.refresh(order)
-        _recalculate_totals(session, order)
+        order.items.append(oi)
+        _recalculate_totals(order)
+        order.updated_at = datetime.utcnow()
         session.add(order)
-        session.commit()
-        session.refresh(order)
-        return {"ok": True, "order": _order_dict(order)}
+        await session.flush()
+        return _record(session, "order.item_added", {"ok": True, "order": _order_dict(order)})
+
+    result = await run_idempotent("orders.add_item", idempotency_key, {
+        "order_id": order_id, "menu_item_id": menu_item_id, "quantity": quantity,
+        "special_requests": special_requests,
+    }, _write)
+    return _publish("order.item_added", result)
 
 
 @mcp.tool(
     name="orders.set_status",
-    description="Update order status: order_id, status in [pending, confirmed, preparing, ready, delivering, completed, canceled].",
+    description=(
+        "Update order status: order_id, status in [pending, confirmed, preparing, ready, delivering, completed, "
+        "canceled], idempotency_key?"
+    ),
 )
-def set_status(order_id: str, status: str) -> Dict[str, Any]:
-    init_db()
+async def set_status(order_id: str, status: str, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    ensure_db()
     try:
         s = OrderStatus(status)
     except Exception:
         return {"ok": False, "error": f"invalid status: {status}"}
-    with Session(get_engine()) as session:
-        order = session.get(Order, order_id)
+    oid = _parse_uuid(order_id)
+
+    async def _write(session: AsyncSession) -> Dict[str, Any]:
+        order = await _get_order(session, oid, for_update=True) if oid else None
         if not order:
-            return {"ok": False, "error": "order not found"}
-        order.status = s
-        session.add(order)
-        session.commit()
-        session.refresh(order)
-        return {"ok": True, "order": _order_dict(order)}
+            return await _not_found(session, oid)
+        previous = order.status
+        # Only move the order from the status it was read in; the rollup
+        # delta is applied once, by the job whose UPDATE matched.
+        changed = await session.exec(
+            update(Order)
+            .where(Order.id == order.id, Order.status == previous)
+            .values(status=s, updated_at=datetime.utcnow())
+        )
+        if changed.rowcount != 1:
+            return {"ok": False, "error": "order status changed concurrently; retry"}
+        await apply_status_change(session, order, previous, s)
+        return _record(session, "order.status_changed", {"ok": True, "order": _order_dict(order)})
+
+    result = await run_idempotent("orders.set_status", idempotency_key, {"order_id": order_id, "status": status}, _write)
+    return _publish("order.status_changed", result)
+
+
+@mcp.tool(
+    name="orders.wait_for_update",
+    description=(
+        "Wait until an order changes (status or items) and return it; use instead of polling orders.get. "
+        "Returns changed=false if nothing happened within timeout_seconds (max 60)."
+    ),
+)
+async def wait_for_update(order_id: str, timeout_seconds: float = 30) -> Dict[str, Any]:
+    oid = _parse_uuid(order_id)
+    if oid is None:
+        return {"ok": False, "error": f"invalid order_id: {order_id}"}
+    with order_events.subscribe(str(oid)) as queue:
+        try:
+            event = await asyncio.wait_for(queue.get(), max(0.0, min(float(timeout_seconds), 60.0)))
+        except asyncio.TimeoutError:
+            return {"ok": True, "changed": False}
+    return {"ok": True, "changed": True, "event": event["type"], "order": event["order"]}
 
 
 @mcp.tool(
     name="orders.get",
-    description="Get an order by id.",
+    description=(
+        "Get an order by id. fields limits the keys returned; compact=true uses short keys and "
+        "summarizes items as strings like '2x Pepperoni 14in'."
+    ),
 )
-def get_order(id: str) -> Dict[str, Any]:
-    init_db()
-    with Session(get_engine()) as session:
-        order = session.get(Order, id)
-        if not order:
-            return {"ok": False, "error": "order not found"}
-        order.items  # touch relationship
-        return {"ok": True, "order": _order_dict(order)}
+async def get_order(id: str, fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    ensure_db()
+    error = fields_error(fields, ORDER_FIELDS)
+    if error:
+        return {"ok": False, "error": error}
+    oid = _parse_uuid(id)
+    if oid is None:
+        return {"ok": False, "error": "order not found"}
+    async with get_async_read_session() as session:
+        order, archived = await _find_order(session, oid, fields)
+    if order is None and not reads_from_primary():
+        # The replica may not have an order created moments ago (possibly
+        # through another server process); a miss is confirmed on the primary.
+        async with get_async_session() as session:
+            order, archived = await _find_order(session, oid, fields)
+    if not order:
+        return {"ok": False, "error": "order not found"}
+    (shaped,) = await _shape_orders([order], fields, compact)
+    if archived:
+        return {"ok": True, "order": shaped, "archived": True}
+    return {"ok": True, "order": shaped}
+
+
+async def _find_order(
+        session: AsyncSession,
+        order_id: uuid.UUID,
+        fields: Optional[List[str]],
+) -> tuple[Optional[Union[Order, ArchivedOrder]], bool]:
+    """The order and whether it came from the archive tables."""
+    if _wants_items(fields):
+        order = await _get_order(session, order_id)
+    else:
+        order = await session.get(Order, order_id)
+    if order is not None:
+        return order, False
+    # Old finished orders live in the archive tables (see orders.archive).
+    options = [selectinload(ArchivedOrder.items)] if _wants_items(fields) else None
+    archived = await session.get(ArchivedOrder, order_id, options=options)
+    return archived, archived is not None
 
 
 @mcp.tool(
     name="orders.list",
-    description="List orders, optionally filtered by customer_id and/or status; limit defaults to 50.",
+    description=(
+        "List orders (newest first), optionally filtered by customer_id and/or status; limit defaults to 50 (max 500). "
+        "Pass next_cursor from a previous response as cursor to fetch the next page. "
+        "fields limits the keys per order (leave out items to skip loading them); compact=true uses short keys "
+        "and summarizes items as strings like '2x Pepperoni 14in'."
+    ),
 )
-def list_orders(
+async def list_orders(
         customer_id: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        compact: bool = False,
 ) -> Dict[str, Any]:
-    init_db()
-    with Session(get_engine()) as session:
+    ensure_db()
+    error = fields_error(fields, ORDER_FIELDS)
+    if error:
+        return {"ok": False, "error": error}
+    limit = int(limit)
+    if limit < 1:
+        return {"ok": False, "error": "limit must be >= 1"}
+    limit = min(limit, MAX_LIST_LIMIT)
+    async with get_async_read_session() as session:
         stmt = select(Order)
+        if _wants_items(fields):
+            stmt = stmt.options(selectinload(Order.items))
         if customer_id:
-            stmt = stmt.where(Order.customer_id == uuid.UUID(str(customer_id)))
+            cid = _parse_uuid(customer_id)
+            if cid is None:
+                return {"ok": False, "error": f"invalid customer_id: {customer_id}"}
+            stmt = stmt.where(Order.customer_id == cid)
         if status:
             try:
                 s = OrderStatus(status)
             except Exception:
                 return {"ok": False, "error": f"invalid status: {status}"}
             stmt = stmt.where(Order.status == s)
-        orders = session.exec(stmt.order_by(Order.created_at.desc()).limit(int(limit))).all()
-        for o in orders:
-            o.items
-        return {"ok": True, "orders": [_order_dict(o) for o in orders]}
+        if cursor:
+            # Keyset pagination on (created_at, id): each page is an index range scan.
+            try:
+                created_at, last_id = decode_cursor(cursor, str, str)
+                created_at, last_id = datetime.fromisoformat(created_at), uuid.UUID(last_id)
+            except ValueError:
+                return {"ok": False, "error": f"invalid cursor: {cursor}"}
+            # The redundant created_at bound gives the planner an index range; the OR alone does not.
+            stmt = stmt.where(Order.created_at <= created_at, or_(
+                Order.created_at < created_at,
+                and_(Order.created_at == created_at, Order.id < last_id),
+            ))
+        stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
+        orders = (await session.exec(stmt)).all()
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+        return {"ok": True, "orders": await _shape_orders(orders, fields, compact), "next_cursor": next_cursor}
+
+
+@mcp.tool(
+    name="orders.archive",
+    description=(
+        "Move completed and canceled orders placed more than retention_days ago (default ORDER_RETENTION_DAYS) "
+        "to the archive tables in batches of batch_size; max_batches limits one run. Archived orders stay "
+        "readable with orders.get but no longer appear in orders.list. Expired idempotency keys are deleted too."
+    ),
+)
+async def archive_finished_orders(
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None,
+) -> Dict[str, Any]:
+    ensure_db()
+    if retention_days is not None and int(retention_days) < 0:
+        return {"ok": False, "error": "retention_days must be >= 0"}
+    if max_batches is not None and int(max_batches) < 1:
+        return {"ok": False, "error": "max_batches must be >= 1"}
+    return await archive_orders(retention_days, batch_size, max_batches)
@@ -0,0 +1,130 @@
+from datetime import date
+from typing import Any, Dict, Optional
+from sqlalchemy import func
+from sqlmodel import select
+
+from pizzagpt_mcp.db.database import ensure_db
+from pizzagpt_mcp.db.models import Customer, DailyCustomerSales, DailyMenuItemSales, DailySales
+from pizzagpt_mcp.db.read_routing import get_async_read_session
+from pizzagpt_mcp.server import mcp
+from pizzagpt_mcp.tools import menu as menu_tools
+
+_GROUPINGS = ("day", "menu_item", "customer")
+
+# Most rows a report returns; bigger limits are clamped to it.
+MAX_REPORT_LIMIT = 1000
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+def _in_range(stmt, column, start: Optional[date], end: Optional[date]):
+    if start:
+        stmt = stmt.where(column >= start)
+    if end:
+        stmt = stmt.where(column <= end)
+    return stmt
+
+
+@mcp.tool(
+    name="reports.sales_summary",
+    description=(
+        "Sales report from pre-aggregated daily rollups of completed orders: group_by in [day, menu_item, customer], "
+        "optional start_date/end_date (YYYY-MM-DD, inclusive, by order date), limit (top rows by revenue for "
+        "menu_item/customer; max 1000)."
+    ),
+)
+async def sales_summary(
+        group_by: str = "day",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Summarize sales without scanning orders.
+
+    Rollup rows are maintained by orders.set_status (see db/rollups.py), so
+    the cost of a report depends on the number of days/items/customers in
+    range, not on the number of orders.
+
+    Returns:
+        A dict with:
+          - ok: bool
+          - group_by, start_date, end_date: the effective query
+          - rows: per-bucket dicts, newest day first for group_by=day,
+            highest revenue first otherwise
+    """
+    ensure_db()
+    if group_by not in _GROUPINGS:
+        return {"ok": False, "error": f"invalid group_by: {group_by}; use one of {', '.join(_GROUPINGS)}"}
+    try:
+        start, end = _parse_date(start_date), _parse_date(end_date)
+    except ValueError:
+        return {"ok": False, "error": "start_date/end_date must be YYYY-MM-DD"}
+    limit = int(limit)
+    if limit < 1:
+        return {"ok": False, "error": "limit must be >= 1"}
+    limit = min(limit, MAX_REPORT_LIMIT)
+
+    async with get_async_read_session() as session:
+        if group_by == "day":
+            stmt = _in_range(select(DailySales), DailySales.day, start, end)
+            days = (await session.exec(stmt.order_by(DailySales.day.desc()).limit(limit))).all()
+            rows = [
+                {
+                    "day": d.day.isoformat(),
+                    "orders_completed": d.orders_completed,
+                    "orders_canceled": d.orders_canceled,
+                    "revenue_cents": d.revenue_cents,
+                    "items_sold": d.items_sold,
+                }
+                for d in days
+            ]
+        elif group_by == "menu_item":
+            revenue = func.sum(DailyMenuItemSales.revenue_cents)
+            stmt = _in_range(
+                select(DailyMenuItemSales.menu_item_id, func.sum(DailyMenuItemSales.quantity), revenue),
+                DailyMenuItemSales.day, start, end,
+            )
+            stmt = stmt.group_by(DailyMenuItemSales.menu_item_id).order_by(revenue.desc()).limit(limit)
+            result = (await session.exec(stmt)).all()
+            menu = await menu_tools.menu_snapshot()
+            rows = []
+            for mid, quantity, cents in result:
+                mi = menu.by_id.get(mid)
+                rows.append({
+                    "menu_item_id": str(mid),
+                    "name": mi["name"] if mi else None,
+                    "size": mi["size"] if mi else None,
+                    "quantity": quantity,
+                    "revenue_cents": cents,
+                })
+        else:
+            revenue = func.sum(DailyCustomerSales.revenue_cents).label("revenue_cents")
+            stmt = _in_range(
+                select(
+                    DailyCustomerSales.customer_id,
+                    func.sum(DailyCustomerSales.orders_completed).label("orders_completed"),
+                    revenue,
+                ),
+                DailyCustomerSales.day, start, end,
+            )
+            top = stmt.group_by(DailyCustomerSales.customer_id).order_by(revenue.desc()).limit(limit).subquery()
+            # Names are joined on after the top-N cut, so only `limit` customers are looked up.
+            stmt = (
+                select(top.c.customer_id, Customer.name, top.c.orders_completed, top.c.revenue_cents)
+                .join(Customer, Customer.id == top.c.customer_id, isouter=True)
+                .order_by(top.c.revenue_cents.desc())
+            )
+            rows = [
+                {"customer_id": str(cid), "name": name, "orders_completed": n, "revenue_cents": cents}
+                for cid, name, n, cents in (await session.exec(stmt)).all()
+            ]
+    return {
+        "ok": True,
+        "group_by": group_by,
+        "start_date": start_date,
+        "end_date": end_date,
+        "rows": rows,
+    }
@@ -0,0 +1,59 @@
+"""
+Shared fixtures: one generated database per test session.
+
+The engines are created when pizzagpt_mcp.db.database is imported, so
+DATABASE_URL is pointed at a throwaway SQLite file before that happens.
+Set TEST_DATABASE_URL to run against another (empty) database instead.
+"""
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Awaitable, Callable, TypeVar
+
+import pytest
+
+_tmp = tempfile.TemporaryDirectory(prefix="pizzagpt-tests-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{Path(_tmp.name) / 'test.db'}"
+os.environ.pop("DATABASE_READ_URL", None)
+
+# Size of the generated data: enough rows that the planner prefers indexes.
+TEST_ORDERS = int(os.getenv("TEST_ORDERS", "5000"))
+TEST_CUSTOMERS = int(os.getenv("TEST_CUSTOMERS", "500"))
+
+T = TypeVar("T")
+
+
+@pytest.fixture(scope="session")
+def db():
+    """The pizzagpt_mcp.db.database module, with the schema created and synthetic data generated."""
+    from pizzagpt_mcp.db import database
+    from pizzagpt_mcp.db.seed_data import generate_synthetic
+
+    database.init_db()
+    generate_synthetic(TEST_CUSTOMERS, 40, TEST_ORDERS, 4, 42)
+    yield database
+    database.get_engine().dispose()
+    _tmp.cleanup()
+
+
+@pytest.fixture
+def run(db) -> Callable[[Awaitable[T]], T]:
+    """Run a coroutine to completion on a fresh event loop.
+
+    The async engines and the write queue belong to the loop that used them,
+    so both are released before the loop closes.
+    """
+    from pizzagpt_mcp.db.write_queue import close_write_queue
+
+    def _run(coro: Awaitable[T]) -> T:
+        async def _main() -> Any:
+            try:
+                return await coro
+            finally:
+                await close_write_queue()
+                await db.dispose_async_engines()
+
+        return asyncio.run(_main())
+
+    return _run
@@ -0,0 +1,81 @@
+"""
+Query budgets: the number of statements each hot tool issues, pinned.
+
+A tool that starts loading relations lazily (N+1) or grows an extra round
+trip fails here. Budgets are counted with tracing.count_queries around the
+tool functions themselves and do not depend on the page size or the number
+of items in an order.
+
+On SQLite every transaction begins with an explicit BEGIN statement (see
+db/database.py), which is counted like any other statement.
+"""
+from typing import Any, Dict
+
+import pytest
+
+from pizzagpt_mcp.db.tracing import count_queries
+from pizzagpt_mcp.tools import customers as customer_tools
+from pizzagpt_mcp.tools import menu as menu_tools
+from pizzagpt_mcp.tools import orders as order_tools
+
+
+def _budget(db, statements: int) -> int:
+    """statements per transaction, plus its BEGIN on SQLite."""
+    return statements + (1 if db.get_engine().dialect.name == "sqlite" else 0)
+
+
+async def _counted(fn, *args: Any, **kwargs: Any) -> tuple[Dict[str, Any], int]:
+    with count_queries() as stats:
+        result = await fn(*args, **kwargs)
+    assert result["ok"], result
+    return result, stats.queries
+
+
+@pytest.mark.parametrize("limit", [5, 100])
+def test_customers_list(db, run, limit):
+    async def _main():
+        page, _ = await _counted(customer_tools.list_customers.fn, limit=limit)
+        _, first = await _counted(customer_tools.list_customers.fn, limit=limit)
+        _, next_page = await _counted(customer_tools.list_customers.fn, limit=limit, cursor=page["next_cursor"])
+        return first, next_page
+
+    # One SELECT per page, with or without a cursor.
+    assert run(_main()) == (_budget(db, 1), _budget(db, 1))
+
+
+@pytest.mark.parametrize("limit", [5, 100])
+def test_orders_list(db, run, limit):
+    async def _main():
+        page, with_items = await _counted(order_tools.list_orders.fn, limit=limit)
+        _, next_page = await _counted(order_tools.list_orders.fn, limit=limit, cursor=page["next_cursor"])
+        _, without_items = await _counted(order_tools.list_orders.fn, limit=limit, fields=["id", "status"])
+        return with_items, next_page, without_items
+
+    with_items, next_page, without_items = run(_main())
+    # Orders plus one selectinload for all of their items; no items query when they are left out.
+    assert with_items == next_page == _budget(db, 2)
+    assert without_items == _budget(db, 1)
+
+
+def test_orders_get(db, run):
+    async def _main():
+        page = await order_tools.list_orders.fn(limit=1)
+        order_id = page["orders"][0]["id"]
+        _, with_items = await _counted(order_tools.get_order.fn, order_id)
+        _, without_items = await _counted(order_tools.get_order.fn, order_id, fields=["id", "status"])
+        return with_items, without_items
+
+    assert run(_main()) == (_budget(db, 2), _budget(db, 1))
+
+
+@pytest.mark.parametrize("item_count", [1, 5])
+def test_orders_create(db, run, item_count):
+    async def _main():
+        customers = await customer_tools.list_customers.fn(limit=1)
+        menu = await menu_tools.list_items.fn()
+        items = [{"menu_item_id": item["id"], "quantity": 1} for item in menu["items"][:item_count]]
+        _, queries = await _counted(order_tools.create_order.fn, customers["customers"][0]["id"], items)
+        return queries
+
+    # Customer, menu prices (one IN query), the order and its items (one executemany).
+    assert run(_main()) == _budget(db, 4)
@@ -0,0 +1,170 @@
+"""
+Query plan regression check: every SELECT issued by the MCP tools must use an index.
+
+Calls each tool through an in-memory MCP client with representative
+arguments against the generated database, records the SELECT statements it
+runs and explains each of them (EXPLAIN QUERY PLAN on SQLite, EXPLAIN on
+Postgres). A plan that scans a whole table ("SCAN orders" without an index,
+or "Seq Scan on orders") fails the test.
+
+Statements listed in WHOLE_TABLE_READS read a whole small table on purpose
+(the cached menu snapshot) and are allowed. Set QUERY_PLANS_VERBOSE=1 (and
+run pytest with -s) to print every plan.
+"""
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+# (tool, table) pairs whose full read is intended: the menu catalog loads
+# every item once per menu change and serves list/get from memory.
+WHOLE_TABLE_READS = {("menu.list_items", "menu_items")}
+
+VERBOSE = os.getenv("QUERY_PLANS_VERBOSE", "0") in ("1", "true", "yes")
+
+# SQLite reports every pass over a whole table (or a whole index) as "SCAN t",
+# index range lookups as "SEARCH t". Postgres reports "Seq Scan on t".
+_SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(.*)")
+_SQLITE_DERIVED = re.compile(r"\b(?:CO-ROUTINE|MATERIALIZE) (\w+)")
+_POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+# Access paths that are not (yet) issued by a tool but that the composite
+# indexes exist for; checked like tool queries.
+_SHAPES = {
+    "menu (active, by name and size)": "SELECT id FROM menu_items WHERE is_active = 1 ORDER BY name, size",
+}
+
+
+def full_scans(dialect: str, statement: str, plan: str) -> List[str]:
+    """Tables the plan reads in full.
+
+    On SQLite a SCAN in index order counts as well when the statement has a
+    WHERE clause: the filter is then applied row by row instead of narrowing
+    the index range (e.g. orders by status walking the created_at index).
+    Unfiltered scans in index order are fine; LIMIT stops them early.
+    """
+    if dialect == "postgresql":
+        return sorted(set(_POSTGRES_FULL_SCAN.findall(plan)))
+    derived = set(_SQLITE_DERIVED.findall(plan))
+    filtered = re.search(r"\bWHERE\b", statement, re.IGNORECASE) is not None
+    tables = set()
+    for match in filter(None, (_SQLITE_SCAN.search(line) for line in plan.splitlines())):
+        table, detail = match.groups()
+        if table in derived or table == "CONSTANT" or "VIRTUAL TABLE" in detail:
+            continue
+        if "INDEX" not in detail or filtered:
+            tables.add(table)
+    return sorted(tables)
+
+
+async def collect() -> List[Tuple[str, str, Any]]:
+    """Run the tools and return the (tool, statement, parameters) SELECTs they issued."""
+    from fastmcp import Client
+    from sqlalchemy import event
+    from pizzagpt_mcp.db import database
+    from pizzagpt_mcp.server import mcp
+
+    statements: List[Tuple[str, str, Any]] = []
+    current = {"tool": None}
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if current["tool"] and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+            statements.append((current["tool"], statement, parameters))
+
+    engines = {database.get_async_engine().sync_engine, database.get_async_read_engine().sync_engine}
+    for sync_engine in engines:
+        event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        async with Client(mcp) as client:
+            async def call(name: str, args: Dict[str, Any]) -> Any:
+                current["tool"] = name
+                result = await client.call_tool(name, args)
+                current["tool"] = None
+                return result.structured_content
+
+            customers = await call("customers.list", {"limit": 50})
+            await call("customers.list", {"limit": 50, "cursor": customers["next_cursor"]})
+            customer = customers["customers"][0]
+            await call("customers.get", {"id": customer["id"]})
+            await call("customers.find_or_create", {"email": customer["email"]})
+            await call("customers.find_or_create", {"phone": customer["phone"]})
+            await call("customers.find_or_create", {"name": customer["name"]})
+
+            menu = await call("menu.list_items", {"only_active": False})
+            await call("menu.get_item", {"id": menu["items"][0]["id"]})
+            await call("menu.search", {"query": "pepperoni"})
+
+            page = await call("orders.list", {"limit": 20})
+            await call("orders.list", {"limit": 20, "cursor": page["next_cursor"]})
+            await call("orders.list", {"limit": 20, "customer_id": customer["id"]})
+            page = await call("orders.list", {"limit": 20, "status": "completed"})
+            await call("orders.list", {"limit": 20, "status": "completed", "cursor": page["next_cursor"]})
+            await call("orders.list", {"limit": 20, "customer_id": customer["id"], "status": "completed"})
+            await call("orders.list", {"limit": 20, "fields": ["id", "status"]})
+            await call("orders.get", {"id": page["orders"][0]["id"]})
+
+            for group_by in ("day", "menu_item", "customer"):
+                await call("reports.sales_summary", {"group_by": group_by, "start_date": "2026-01-01", "limit": 10})
+
+            created = await call("orders.create", {
+                "customer_id": customer["id"], "items": [{"menu_item_id": menu["items"][0]["id"], "quantity": 1}],
+                "idempotency_key": "plan-check",
+            })
+            order_id = created["order"]["id"]
+            await call("orders.add_item", {"order_id": order_id, "menu_item_id": menu["items"][1]["id"]})
+            await call("orders.set_status", {"order_id": order_id, "status": "completed"})
+            await call("orders.create_many", {"orders": [
+                {"customer_id": customer["id"], "items": [{"menu_item_id": menu["items"][0]["id"], "quantity": 2}]},
+            ]})
+            # A retention window older than any order: runs the selection query, moves nothing.
+            await call("orders.archive", {"retention_days": 36500})
+            await call("orders.get", {"id": "00000000-0000-0000-0000-000000000000"})
+    finally:
+        for sync_engine in engines:
+            event.remove(sync_engine, "before_cursor_execute", _record)
+    return statements
+
+
+async def explain(dialect: str, statements: List[Tuple[str, str, Any]]) -> List[Tuple[str, str, str]]:
+    """(tool, statement, plan) for each distinct statement, plus the _SHAPES."""
+    from pizzagpt_mcp.db import database
+
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    queries = [*statements, *((label, stmt, ()) for label, stmt in _SHAPES.items())]
+    seen = set()
+    plans = []
+    # The async engine, so statements are explained in the paramstyle they were issued in.
+    async with database.get_async_engine().connect() as conn:
+        for tool, statement, parameters in queries:
+            if (tool, statement) in seen:
+                continue
+            seen.add((tool, statement))
+            rows = await conn.exec_driver_sql(prefix + statement, parameters)
+            plans.append((tool, statement, "\n".join(" | ".join(map(str, row)) for row in rows)))
+    return plans
+
+
+def test_full_scans_flags_unindexed_and_filtered_scans():
+    assert full_scans("sqlite", "SELECT * FROM orders", "2 | 0 | 0 | SCAN orders") == ["orders"]
+    # Index-order scan without a filter: LIMIT stops it early.
+    plan = "2 | 0 | 0 | SCAN orders USING INDEX ix_orders_created_at"
+    assert full_scans("sqlite", "SELECT * FROM orders ORDER BY created_at LIMIT 5", plan) == []
+    assert full_scans("sqlite", "SELECT * FROM orders WHERE status = ? ORDER BY created_at", plan) == ["orders"]
+    plan = "3 | 0 | 0 | SEARCH orders USING INDEX ix_orders_status_created_at (status=?)"
+    assert full_scans("sqlite", "SELECT * FROM orders WHERE status = ?", plan) == []
+    assert full_scans("postgresql", "SELECT 1", "Seq Scan on orders  (cost=0.00..1.00 rows=1)") == ["orders"]
+
+
+def test_tool_queries_use_indexes(db, run):
+    statements = run(collect())
+    assert statements, "no SELECT statements were recorded"
+    dialect = db.get_engine().dialect.name
+    failures = []
+    for tool, statement, plan in run(explain(dialect, statements)):
+        scans = [t for t in full_scans(dialect, statement, plan) if (tool, t) not in WHOLE_TABLE_READS]
+        if scans or VERBOSE:
+            status = "FULL SCAN " + ", ".join(scans) if scans else "ok"
+            report = f"[{status}] {tool}: {' '.join(statement.split())[:200]}\n    " + plan.replace("\n", "\n    ")
+            print(report)
+            if scans:
+                failures.append(report)
+    assert not failures, f"{len(failures)} queries read whole tables:\n" + "\n".join(failures)